@@ -0,0 +1,111 @@
+"""Content-addressed store for overlay assets, plus atomic output writes.
+
+Files are kept once under ``<root>/<xx>/<sha256><suffix>`` and hard-linked
+into each output folder, falling back to a plain copy when linking is not
+possible (different drive, FAT/exFAT, network share). Digests are remembered
+per (path, size, mtime) so an unchanged logo is hashed once per process no
+matter how many overlays use it.
+"""
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+def _stat_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+def atomic_write(path, data):
+    """Write ``data`` to a temp file next to ``path`` and rename it into place."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def write_if_changed(path, data):
+    """Atomically write ``data`` unless ``path`` already holds exactly it.
+
+    Returns True when the file was written.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, data)
+    return True
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class AssetStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self._digests = {}
+
+    def digest(self, path):
+        """SHA-256 of ``path``, skipping the read when size and mtime are unchanged."""
+        key = _stat_key(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = file_digest(path)
+        return digest
+
+    def add(self, path):
+        """Store ``path`` by content and return the stored file's path."""
+        path = Path(path)
+        digest = self.digest(path)
+        stored = self.root / digest[:2] / (digest + path.suffix.lower())
+        if not stored.exists():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            tmp = stored.with_name(f"{stored.name}.{os.getpid()}.tmp")
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, stored)
+            self._digests[_stat_key(stored)] = digest
+        return stored
+
+    def derived(self, src, tag, suffix, build):
+        """Store what ``build()`` makes from ``src``, building it once per (content, ``tag``).
+
+        ``build`` may return None when nothing should be derived; None is
+        then returned and nothing is stored.
+        """
+        key = hashlib.sha256(f"{self.digest(src)}:{tag}".encode()).hexdigest()
+        stored = self.root / "derived" / key[:2] / (key + suffix)
+        if stored.exists():
+            return stored
+        data = build()
+        if data is None:
+            return None
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(stored, data)
+        return stored
+
+    def place(self, src, dest):
+        """Make ``dest`` hold the contents of ``src``.
+
+        Returns False when ``dest`` already matched and nothing was written.
+        """
+        return self.link(self.add(src), dest)
+
+    def link(self, stored, dest):
+        """Hard-link (or copy) a file already in the store to ``dest``, unless it matches."""
+        dest = Path(dest)
+        if dest.exists():
+            if os.path.samefile(dest, stored):
+                return False
+            if dest.stat().st_size == stored.stat().st_size and self.digest(dest) == self.digest(stored):
+                return False
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        try:
+            os.link(stored, tmp)
+        except OSError:
+            shutil.copyfile(stored, tmp)
+        os.replace(tmp, dest)
+        return True
@@ -0,0 +1,166 @@
+"""Render many overlay variants from a CSV or JSONL manifest.
+
+Each manifest row holds any subset of ``render_overlay``'s keyword arguments;
+missing settings fall back to ``overlay_core.DEFAULTS``. A row may also give ``font`` (a
+family name, expanded with ``make_css_font_stack``) and ``name``, which picks
+the row's folder under the output root when ``output_dir`` is not set.
+
+    python batch.py manifest.csv --out overlays --workers 8
+    python batch.py manifest.csv --out overlays --runtime
+    python batch.py manifest.csv --out overlays.zip
+
+``--runtime`` writes a single runtime-parameterized ``overlay.html`` plus a
+``<name>.js`` config per row instead (see ``runtime_overlay``). An ``--out``
+ending in ``.zip``, ``.tar``, ``.tar.gz`` (...) streams every overlay into
+that archive instead of a folder (see ``sinks``).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from overlay_core import PROFILES, render_overlay, resolve_settings
+from sinks import ARCHIVE_SUFFIXES, RecordingSink, open_sink, replay
+
+BatchResult = namedtuple("BatchResult", "index output_dir changed error timings")
+
+def load_manifest(path):
+    """Read manifest rows from a ``.csv`` or ``.jsonl`` file.
+
+    Relative logo paths are resolved against the manifest's folder and empty
+    CSV cells are dropped so they fall back to the defaults.
+    """
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            rows = [{k: v for k, v in row.items() if k and v not in (None, "")} for row in csv.DictReader(f)]
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        if row.get("logo_path"):
+            row["logo_path"] = str(path.parent / row["logo_path"])
+    return rows
+
+def resolve_row(row, index, output_root):
+    """Turn one manifest row into the full keyword arguments for ``render_overlay``."""
+    row = dict(row)
+    name = str(row.pop("name", "") or f"{index:05d}")
+    kwargs = resolve_settings(row)
+    kwargs["output_dir"] = Path(output_root) / row.get("output_dir", name)
+    return kwargs
+
+def _render_row(job, sink=None):
+    index, row, output_root = job
+    report = {}
+    try:
+        path = render_overlay(**resolve_row(row, index, output_root), incremental=True, report=report, sink=sink)
+        return BatchResult(index, path, report["changed"], None, report["timings"])
+    except Exception as e:
+        return BatchResult(index, None, [], f"{type(e).__name__}: {e}", {})
+
+def _record_chunk(jobs, shared_assets):
+    done = []
+    for job in jobs:
+        recorder = RecordingSink(shared_assets)
+        done.append((_render_row(job, recorder), recorder.ops))
+    return done
+
+def _render_into(jobs, sink, workers, chunksize):
+    # Workers record their files and the parent writes them into the sink in
+    # row order. At most two chunks per worker are in flight, so memory stays
+    # flat however many rows there are.
+    results = []
+    def drain(future):
+        for result, ops in future.result():
+            if not result.error:
+                replay(ops, sink)
+                result = result._replace(output_dir=sink.location(result.output_dir))
+            results.append(result)
+    chunksize = chunksize or max(1, min(64, len(jobs) // (workers * 4)))
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(jobs), chunksize):
+            pending.append(pool.submit(_record_chunk, jobs[start:start + chunksize], sink.shared_assets))
+            if len(pending) >= 2 * workers:
+                drain(pending.popleft())
+        while pending:
+            drain(pending.popleft())
+    return results
+
+def render_batch(rows, output_root="overlays", workers=None, chunksize=None, sink=None):
+    """Render every row across a process pool.
+
+    A failing row never stops the run; its error is reported in the returned
+    list of ``BatchResult``, which is ordered like ``rows``. With a ``sink``
+    (see ``sinks``) the overlays go into it, under ``output_root`` inside it.
+    """
+    rows = list(rows)
+    jobs = [(i, row, str(output_root)) for i, row in enumerate(rows)]
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [_render_row(job, sink) for job in jobs]
+    if sink is not None:
+        return _render_into(jobs, sink, workers, chunksize)
+    # Large chunks keep the per-task pickling overhead negligible next to the
+    # render itself, while still leaving a few chunks per worker for balance.
+    chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_row, jobs, chunksize=chunksize))
+
+def aggregate_timings(results):
+    """Per-stage totals across a batch: ``{stage: {"total", "mean", "max", "count"}}`` in seconds."""
+    stages = {}
+    for result in results:
+        for stage, seconds in result.timings.items():
+            stages.setdefault(stage, []).append(seconds)
+    return {stage: {"total": sum(values), "mean": sum(values) / len(values), "max": max(values),
+                    "count": len(values)} for stage, values in stages.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render overlay variants from a CSV/JSONL manifest.")
+    parser.add_argument("manifest", help="CSV or JSONL file, one overlay per row")
+    parser.add_argument("--out", default="overlays",
+                        help="root folder for rows without an absolute output_dir, or a .zip/.tar(.gz) to write into")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--timings", action="store_true", help="print time spent per render stage")
+    parser.add_argument("--runtime", action="store_true",
+                        help="one overlay.html for all rows, each row a <name>.js config (open overlay.html?config=<name>)")
+    parser.add_argument("--profile", choices=PROFILES, default="full", help="animation profile for --runtime")
+    args = parser.parse_args(argv)
+
+    rows = load_manifest(args.manifest)
+    start = time.perf_counter()
+    if args.runtime:
+        from runtime_overlay import export_variants
+        errors = {name: error for name, error in export_variants(rows, args.out, args.profile).items() if error}
+        for name, error in errors.items():
+            print(f"{name}: {error}", file=sys.stderr)
+        print(f"wrote {len(rows) - len(errors)}/{len(rows)} variant configs in {time.perf_counter() - start:.2f}s")
+        return 1 if errors else 0
+    if args.out.lower().endswith(ARCHIVE_SUFFIXES):
+        with open_sink(args.out) as sink:
+            results = render_batch(rows, "", workers=args.workers, sink=sink)
+    else:
+        results = render_batch(rows, args.out, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r.error]
+    for r in failed:
+        print(f"row {r.index}: {r.error}", file=sys.stderr)
+    updated = sum(1 for r in results if r.changed)
+    print(f"rendered {len(results) - len(failed)}/{len(results)} overlays ({updated} updated) in {elapsed:.2f}s")
+    if args.timings:
+        # Summed over workers, so the total can exceed the wall time.
+        for stage, t in aggregate_timings(results).items():
+            print(f"  {stage:10} total {t['total'] * 1000:9.1f}ms  mean {t['mean'] * 1e6:8.1f}us  max {t['max'] * 1e6:8.1f}us")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
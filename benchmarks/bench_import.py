@@ -0,0 +1,34 @@
+"""Startup cost of the headless core vs the full GUI module.
+
+Each import runs in a fresh interpreter so nothing is already cached.
+Run from the repo root:  python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = [
+    ("python (no imports)", "pass"),
+    ("import overlay_core", "import overlay_core"),
+    ("import main", "import main"),
+    ("import gui (old main.py)", "import gui"),
+]
+
+def time_import(code, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main_bench(repeat=15):
+    for label, code in CASES:
+        print(f"{label:28s} {time_import(code, repeat) * 1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main_bench()
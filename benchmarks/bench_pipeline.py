@@ -0,0 +1,119 @@
+"""Benchmark suite for the render pipeline, broken down by stage.
+
+Run from the repo root:
+
+    python benchmarks/bench_pipeline.py                   # everything, batches up to 10k
+    python benchmarks/bench_pipeline.py --max-batch 1000 --json results.json
+
+Cases: a single cold render, the same render again (cached, nothing
+written), a large logo with and without Optimize Logo, the template split
+into timeline math and Jinja, and batches of 1 to 10k rows. With ``--json``
+the numbers are also written out so runs can be diffed for regressions.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import batch  # noqa: E402
+import overlay_core as core  # noqa: E402
+from asset_store import AssetStore  # noqa: E402
+from timeline import Timeline  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+def make_logo(path, size):
+    # Random pixels: incompressible, so the PNG is as heavy as its size allows.
+    from PIL import Image
+    Image.frombytes("RGBA", size, os.urandom(size[0] * size[1] * 4)).save(path, compress_level=1)
+    return path
+
+def render(logo, out, store, **options):
+    report = {}
+    start = time.perf_counter()
+    core.render_overlay(**core.resolve_settings({"logo_path": str(logo), "output_dir": str(out)}),
+                        asset_store=store, report=report, **options)
+    return time.perf_counter() - start, report["timings"]
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def stages_text(timings):
+    return "  ".join(f"{stage} {seconds * 1e3:.2f}" for stage, seconds in timings.items())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-batch", type=int, default=BATCH_SIZES[-1])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        small = make_logo(tmp / "logo.png", (512, 256))
+        large = make_logo(tmp / "large.png", (4096, 2048))
+
+        print("single render (ms, per stage)")
+        core.overlay_template.cache_clear()
+        core._cached_html.cache_clear()
+        for name, logo, out, options in [
+            ("cold (compile, new store)", small, "cold", {}),
+            ("cached (nothing changes)", small, "cold", {"incremental": True}),
+            ("large logo 4096x2048", large, "large", {}),
+            ("large logo, optimize (build)", large, "large_opt", {"optimize_logo": True}),
+            ("large logo, optimize (cached)", large, "large_opt", {"optimize_logo": True, "incremental": True}),
+        ]:
+            store = AssetStore(tmp / ("store_" + out))
+            total, timings = render(logo, tmp / out, store, **options)
+            results[name] = {"total": total, "stages": timings}
+            print(f"  {name:32} {total * 1e3:8.2f}   {stages_text(timings)}")
+
+        print("template (us, median)")
+        settings = core.resolve_settings({"logo_path": str(small)})
+        params = {name: settings[name] for name in core.RENDER_PARAMS}
+        def uncached():
+            core._cached_html.cache_clear()
+            core.overlay_html(**params)
+        template = {
+            "timeline": timed(lambda: Timeline.from_settings(settings).css_percentages(), 2000),
+            "timeline + jinja": timed(uncached, 2000),
+            "cache hit": timed(lambda: core.overlay_html(**params), 2000),
+        }
+        results["template"] = template
+        for name, seconds in template.items():
+            print(f"  {name:32} {seconds * 1e6:8.1f}")
+
+        print(f"batch (workers={args.workers or os.cpu_count()})")
+        results["batch"] = {}
+        rows = [{"logo_path": str(small), "brand_text": f"streamer {i}"} for i in range(args.max_batch)]
+        for size in (n for n in BATCH_SIZES if n <= args.max_batch):
+            out = tmp / f"batch_{size}"
+            start = time.perf_counter()
+            done = batch.render_batch(rows[:size], out, workers=args.workers)
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            batch.render_batch(rows[:size], out, workers=args.workers)
+            rerun = time.perf_counter() - start
+            stages = {stage: t["mean"] for stage, t in batch.aggregate_timings(done).items()}
+            results["batch"][size] = {"first": first, "rerun": rerun, "per_row": first / size, "stage_means": stages}
+            print(f"  {size:6d} rows  first {first:7.2f}s  rerun {rerun:7.2f}s  "
+                  f"{first / size * 1e3:6.2f} ms/row   mean ms: {stages_text(stages)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
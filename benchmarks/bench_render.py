@@ -0,0 +1,74 @@
+"""Cold vs warm cost of building the overlay HTML.
+
+Run from the repo root:  python benchmarks/bench_render.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import overlay_core as core  # noqa: E402
+
+SETTINGS = dict(
+    brand_text="cody raves",
+    tagline_text="twitch.tv/cody_raves",
+    show_tagline=True,
+    in_duration=4.0,
+    sustain_duration=10.0,
+    out_duration=4.0,
+    text_in_anim=1.6,
+    logo_in_anim=1.2,
+    text_in_px=280,
+    logo_in_px=280,
+    text_out_px=140,
+    logo_out_px=140,
+    accent_color="#00C2FF",
+    text_color="#FFFFFF",
+    muted_color="rgba(255,255,255,0.75)",
+    brand_size_css="clamp(20px, 5.2vmin, 64px)",
+    container_max_w="92vmin",
+    stroke_scale=1.18,
+    stroke_reveal_seconds=0.6,
+    stroke_hide_seconds=0.6,
+    font_family_css=core.make_css_font_stack("Segoe UI"),
+    banner_bg_hex="#000000",
+    banner_bg_opacity=0.18,
+    underline_delay_seconds=0.15,
+    underline_duration_seconds=3.45,
+    tagline_reveal_seconds=0.7,
+    tagline_hide_seconds=0.5,
+    enable_hover=True,
+    hover_x_px=8,
+    hover_y_px=4,
+    profile="full",
+)
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def main_bench(repeat=2000):
+    # First call pays for parsing and compiling the template.
+    core.overlay_template.cache_clear()
+    core._cached_html.cache_clear()
+    first = timed(lambda: core.overlay_html(**SETTINGS), 1)
+
+    # Template compiled, but every call misses the HTML cache.
+    def uncached():
+        core._cached_html.cache_clear()
+        core.overlay_html(**SETTINGS)
+    cold = timed(uncached, repeat)
+
+    # Repeat renders with identical settings.
+    warm = timed(lambda: core.overlay_html(**SETTINGS), repeat)
+
+    print(f"first render (compile + render): {first * 1e6:10.1f} us")
+    print(f"cold render (timeline + jinja):  {cold * 1e6:10.1f} us")
+    print(f"warm render (cache hit):         {warm * 1e6:10.1f} us")
+    print(f"speedup warm vs cold:            {cold / warm:10.1f}x")
+
+if __name__ == "__main__":
+    main_bench()
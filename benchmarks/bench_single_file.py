@@ -0,0 +1,74 @@
+"""Folder layout vs single-file export: size, file:// fetches and copy time.
+
+Run from the repo root:  python benchmarks/bench_single_file.py [logo.png] [--copies 200]
+
+Without a logo a 1024x512 test image is generated (needs Pillow).
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import overlay_core as core  # noqa: E402
+from asset_store import AssetStore  # noqa: E402
+
+LAYOUTS = {
+    "folder": {},
+    "folder + outline": {"stroke_asset": True},
+    "single file": {"single_file": True},
+    "single file, minified": {"single_file": True, "minify": True},
+    "single file + outline, min.": {"single_file": True, "minify": True, "stroke_asset": True},
+}
+
+def fetches(html):
+    # The document itself, plus one request per element that loads a file:
+    # the folder layout loads the logo twice (<img> and the outline mask).
+    return 1 + len(re.findall(r'src="assets/', html)) + len(re.findall(r"[ ;]mask-image: url\('assets/", html))
+
+def tree_size(root):
+    files = [p for p in Path(root).rglob("*") if p.is_file()]
+    return len(files), sum(p.stat().st_size for p in files)
+
+def test_logo(folder):
+    from PIL import Image, ImageDraw
+    path = Path(folder) / "logo.png"
+    img = Image.new("RGBA", (1024, 512), (0, 0, 0, 0))
+    ImageDraw.Draw(img).ellipse((16, 16, 1008, 496), fill=(0, 194, 255, 255), outline=(255, 255, 255, 255), width=24)
+    img.save(path)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("logo", nargs="?")
+    parser.add_argument("--copies", type=int, default=200, help="overlays copied per layout for the sync timing")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        logo = Path(args.logo) if args.logo else test_logo(tmp)
+        store = AssetStore(tmp / "store")
+        print(f"{'layout':30} {'files':>5} {'bytes':>10} {'fetches':>7} {'copy x%d' % args.copies:>10}")
+        for name, options in LAYOUTS.items():
+            out = tmp / name.replace(" ", "_").replace(",", "").replace("+", "plus")
+            core.render_overlay(**core.resolve_settings({"logo_path": str(logo), "output_dir": str(out)}),
+                                asset_store=store, **options)
+            files, size = tree_size(out)
+            html = (out / "overlay.html").read_text(encoding="utf-8")
+            start = time.perf_counter()
+            for i in range(args.copies):
+                # copytree copies every file, as a sync to a scene machine would.
+                shutil.copytree(out, tmp / "copies" / f"{i}")
+            copy = time.perf_counter() - start
+            shutil.rmtree(tmp / "copies")
+            print(f"{name:30} {files:5d} {size:10d} {fetches(html):7d} {copy * 1000:8.1f}ms")
+        if os.name != "nt":
+            print("(copy times are local-disk; network shares and sync tools pay more per file)")
+
+if __name__ == "__main__":
+    main()
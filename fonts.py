@@ -0,0 +1,195 @@
+"""Find installed font files and build subset WOFF2 faces to embed in overlays.
+
+Reading faces and subsetting use fontTools (brotli writes the WOFF2), loaded
+by ``_fonttools()`` on first use since ``fontTools.subset`` alone takes
+~0.2 s to import. Scans are kept in a catalog under ``cache_dir()`` so the
+next start only re-reads font folders that changed.
+"""
+import base64
+import io
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc", ".otc")
+
+# Bump when the catalog layout or what gets read from a face changes.
+CATALOG_VERSION = 1
+
+# Weights the overlay CSS asks for: .brand is bold, .tagline medium.
+BRAND_WEIGHT = 700
+TAGLINE_WEIGHT = 500
+
+def _fonttools():
+    try:
+        from fontTools import subset, ttLib
+    except ImportError:
+        raise ImportError("Font embedding needs fontTools and brotli (pip install fonttools brotli)") from None
+    return subset, ttLib
+
+def font_dirs():
+    """Folders the OS installs fonts into, system-wide and per user."""
+    home = Path.home()
+    if sys.platform == "win32":
+        windir = Path(os.environ.get("WINDIR", r"C:\Windows"))
+        dirs = [windir / "Fonts"]
+        if os.environ.get("LOCALAPPDATA"):
+            dirs.append(Path(os.environ["LOCALAPPDATA"]) / "Microsoft" / "Windows" / "Fonts")
+    elif sys.platform == "darwin":
+        dirs = [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library" / "Fonts"]
+    else:
+        data_home = Path(os.environ.get("XDG_DATA_HOME") or home / ".local" / "share")
+        dirs = [Path("/usr/share/fonts"), Path("/usr/local/share/fonts"), data_home / "fonts", home / ".fonts"]
+    return [d for d in dirs if d.is_dir()]
+
+def _face_info(font):
+    names = font["name"]
+    family = names.getDebugName(16) or names.getDebugName(1)
+    weight = font["OS/2"].usWeightClass if "OS/2" in font else 400
+    italic = bool(font["OS/2"].fsSelection & 1) if "OS/2" in font else False
+    variable = "fvar" in font
+    return family, weight, italic, variable
+
+def _read_faces(ttLib, path):
+    # -> [(family, weight, italic, variable, font_number), ...]
+    try:
+        if path.suffix.lower() in (".ttc", ".otc"):
+            collection = ttLib.TTCollection(str(path), lazy=True)
+            return [_face_info(f) + (i,) for i, f in enumerate(collection.fonts)]
+        with ttLib.TTFont(str(path), lazy=True) as font:
+            return [_face_info(font) + (0,)]
+    except (ttLib.TTLibError, OSError, KeyError, AssertionError, IndexError):
+        return []
+
+def _scan_dir(dirpath):
+    # Only the files directly in ``dirpath``; subfolders have their own entry.
+    _, ttLib = _fonttools()
+    faces = []
+    for name in sorted(os.listdir(dirpath)):
+        path = Path(dirpath) / name
+        if name.lower().endswith(FONT_SUFFIXES) and path.is_file():
+            faces.extend([*info[:4], str(path), info[4]] for info in _read_faces(ttLib, path) if info[0])
+    return faces
+
+def _folder_mtimes():
+    # Adding, removing or renaming a font file bumps its folder's mtime.
+    mtimes = {}
+    for root in font_dirs():
+        for dirpath, _, _ in os.walk(root):
+            try:
+                mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                pass
+    return mtimes
+
+def catalog_path():
+    from overlay_core import cache_dir
+    return cache_dir() / "fonts.json"
+
+def _load_catalog(path):
+    try:
+        catalog = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(catalog, dict) or catalog.get("version") != CATALOG_VERSION:
+        return {}
+    return catalog.get("folders", {})
+
+def _save_catalog(path, folders):
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"version": CATALOG_VERSION, "folders": folders}), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only cache only costs a rescan next time.
+        pass
+
+@lru_cache(maxsize=None)
+def installed_faces():
+    """Every installed face as ``(family, weight, italic, variable, path, font_number)``.
+
+    Read from the catalog; a folder is rescanned (which needs fontTools) only
+    when its mtime differs from the one recorded with it.
+    """
+    path = catalog_path()
+    cached = _load_catalog(path)
+    folders = {}
+    for dirpath, mtime in _folder_mtimes().items():
+        entry = cached.get(dirpath)
+        if entry is None or entry.get("mtime") != mtime:
+            entry = {"mtime": mtime, "faces": _scan_dir(dirpath)}
+        folders[dirpath] = entry
+    if folders != cached:
+        _save_catalog(path, folders)
+    return [tuple(face) for entry in folders.values() for face in entry["faces"]]
+
+def _closest(faces, weight):
+    def distance(face):
+        fam, w, italic, variable, path, number = face
+        return (italic, 0 if variable else abs(w - weight), w < weight)
+    return min(faces, key=distance)
+
+def find_font_file(family, weight=400):
+    """``(path, font_number, weight)`` of the upright face of ``family`` closest to ``weight``.
+
+    A variable font covers every weight. Returns None when the family is not
+    installed.
+    """
+    wanted = family.strip().casefold()
+    candidates = [f for f in installed_faces() if f[0].casefold() == wanted]
+    if not candidates:
+        return None
+    fam, w, italic, variable, path, number = _closest(candidates, weight)
+    return path, number, (None if variable else w)
+
+def font_families():
+    """``{family: path}`` of every installed family, sorted case-insensitively.
+
+    The path is the file ``find_font_file(family)`` resolves to.
+    """
+    by_family = {}
+    for face in installed_faces():
+        by_family.setdefault(face[0], []).append(face)
+    return {family: _closest(by_family[family], 400)[4] for family in sorted(by_family, key=str.casefold)}
+
+def primary_family(font_family_css):
+    """First family name in a CSS ``font-family`` list."""
+    return font_family_css.split(",")[0].strip().strip("\"'")
+
+def subset_woff2(path, text, font_number=0):
+    """WOFF2 bytes of the font at ``path`` cut down to the glyphs ``text`` needs."""
+    ft_subset, _ = _fonttools()
+    options = ft_subset.Options()
+    options.flavor = "woff2"
+    options.desubroutinize = True
+    # FontForge's timestamp table; fontTools cannot subset it and warns.
+    options.drop_tables += ["FFTM"]
+    options.font_number = font_number
+    font = ft_subset.load_font(str(path), options, dontLoadGlyphNames=True)
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    ft_subset.save_font(font, buf, options)
+    return buf.getvalue()
+
+def font_face_css(family, woff2, weight=None):
+    """An ``@font-face`` rule with ``woff2`` inlined as a data URI.
+
+    ``weight`` None declares the full 1-1000 range (a variable font).
+    """
+    src = "data:font/woff2;base64," + base64.b64encode(woff2).decode("ascii")
+    weight = "1 1000" if weight is None else str(weight)
+    family = family.replace('"', "")
+    return (f'@font-face {{ font-family: "{family}"; src: url({src}) format("woff2"); '
+            f"font-weight: {weight}; font-style: normal; font-display: block; }}")
+
+def face_texts(brand_text, tagline_text, show_tagline):
+    """Text each weight the overlay uses has to render."""
+    texts = {BRAND_WEIGHT: brand_text}
+    if show_tagline and tagline_text:
+        texts[TAGLINE_WEIGHT] = tagline_text
+    return texts
@@ -0,0 +1,426 @@
+"""Offline export: rasterize the overlay loop to a PNG sequence (and optionally
+an alpha video) without a browser.
+
+The banner, text, underline, tagline, logo and outline are drawn once with
+Pillow. Each frame is then composited from those layers with NumPy, using the
+per-frame state from ``Timeline.sample``. Frames are split across a process
+pool, and an ``ffmpeg`` found on PATH can pack them into WebM (VP9) or
+MOV (ProRes 4444), both with alpha.
+
+    python frames.py --config settings.json --out frames --fps 60 --video webm
+
+Layout follows the overlay CSS closely but not pixel for pixel: the tagline
+is a single line and letter-spacing is ignored.
+"""
+import math
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageFont
+
+import fonts
+from overlay_core import CANVAS, PROFILES, css_length_px, hex_to_rgb, resolve_settings
+from timeline import Timeline
+
+# Blur radii are rounded to this step (px) so frames that hold or revisit a
+# radius reuse the blurred layer; at most BLUR_CACHE layers are kept.
+BLUR_STEP = 0.05
+BLUR_CACHE = 16
+# Room around the banner for the banner-level blur and scale.
+STAGE_MARGIN = 64
+
+VIDEO_FORMATS = {
+    "webm": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuva420p", "-b:v", "0", "-crf", "30", "-auto-alt-ref", "0"],
+    "mov": ["-c:v", "prores_ks", "-profile:v", "4444", "-pix_fmt", "yuva444p10le"],
+}
+
+def _color(value, fallback=(255, 255, 255, 255)):
+    try:
+        rgba = ImageColor.getrgb(value)
+    except ValueError:
+        return fallback
+    return rgba if len(rgba) == 4 else rgba + (255,)
+
+def _premultiplied(img):
+    a = np.asarray(img.convert("RGBA"), dtype=np.float32) / 255.0
+    a[..., :3] *= a[..., 3:4]
+    return a
+
+def _load_font(font_path, family, size, weight):
+    if font_path:
+        return ImageFont.truetype(font_path, round(size))
+    try:
+        found = fonts.find_font_file(family, weight)
+    except ImportError:
+        found = None
+    try:
+        if found:
+            return ImageFont.truetype(found[0], round(size), index=found[1])
+        return ImageFont.truetype(family, round(size))
+    except OSError:
+        return ImageFont.load_default(round(size))
+
+def _text_layer(text, font, color, height):
+    left, top, right, bottom = font.getbbox(text)
+    img = Image.new("RGBA", (max(1, math.ceil(right)), max(1, math.ceil(height))), (0, 0, 0, 0))
+    # Centre the glyph box vertically in the CSS line box.
+    ImageDraw.Draw(img).text((0, (height - (bottom + top)) / 2), text, font=font, fill=color)
+    return _premultiplied(img)
+
+class Layers:
+    """Every static element of one overlay, drawn once, in banner-local pixels."""
+
+    def __init__(self, settings, font_path=None, viewport=CANVAS):
+        b = css_length_px(settings["brand_size_css"], viewport)
+        family = fonts.primary_family(settings["font_family_css"])
+        self.brand_px = b
+
+        brand_font = _load_font(font_path, family, b, fonts.BRAND_WEIGHT)
+        self.brand = _text_layer(settings["brand_text"], brand_font, _color(settings["text_color"]), 1.05 * b)
+
+        uline_h = max(2, round(b * 0.05))
+        self.underline = np.zeros((uline_h, self.brand.shape[1], 4), np.float32)
+        self.underline[:] = np.array(_color(settings["accent_color"]), np.float32) / 255.0
+        self.underline[..., :3] *= self.underline[..., 3:4]
+
+        self.tagline = None
+        if settings["show_tagline"] and settings["tagline_text"]:
+            tag_px = max(12.0, min(b * 0.42, 24.0))
+            tag_font = _load_font(font_path, family, tag_px, fonts.TAGLINE_WEIGHT)
+            self.tagline = _text_layer(settings["tagline_text"], tag_font, _color(settings["muted_color"]), tag_px * 1.2)
+            self.tagline = self.tagline[:, : math.ceil(b * 20)]
+
+        with Image.open(settings["logo_path"]) as img:
+            logo = img.convert("RGBA")
+        logo_h = round(b)
+        logo_w = min(round(logo.width * logo_h / logo.height), math.ceil(b * 6))
+        logo = logo.resize((logo_w, logo_h), Image.LANCZOS)
+        self.logo = _premultiplied(logo)
+
+        # The outline is the logo's silhouette scaled by stroke_scale around
+        # its centre, like the CSS mask.
+        scale = settings["stroke_scale"]
+        sw, sh = max(1, round(logo_w * scale)), max(1, round(logo_h * scale))
+        silhouette = Image.new("RGBA", (sw, sh), _color(settings["accent_color"])[:3] + (0,))
+        silhouette.putalpha(logo.getchannel("A").resize((sw, sh), Image.LANCZOS))
+        self.stroke = _premultiplied(silhouette)
+
+        # Banner box: padding, column gap and row gap from the CSS variables.
+        pad_y, pad_x, gap, row_gap = b * 0.30, b * 0.55, b * 0.45, b * 0.18
+        text_w = max(self.brand.shape[1], self.tagline.shape[1] if self.tagline is not None else 0)
+        text_h = self.brand.shape[0] + ((row_gap + self.tagline.shape[0]) if self.tagline is not None else 0)
+        inner_h = max(text_h, logo_h)
+        self.width = round(pad_x * 2 + text_w + gap + logo_w)
+        self.height = round(pad_y * 2 + inner_h)
+
+        self.text_pos = (round(pad_x), round(pad_y + (inner_h - text_h) / 2))
+        self.text_size = (text_w, round(text_h))
+        self.brand_pos = (0, 0)
+        self.underline_pos = (0, round(self.brand.shape[0] + b * 0.08 - uline_h))
+        self.tagline_pos = (0, round(self.brand.shape[0] + row_gap))
+        self.logo_pos = (round(pad_x + text_w + gap), round(pad_y + (inner_h - logo_h) / 2))
+        self.stroke_pos = (self.logo_pos[0] - (sw - logo_w) // 2, self.logo_pos[1] - (sh - logo_h) // 2)
+
+        r, g, bl = hex_to_rgb(settings["banner_bg_hex"])
+        opacity = max(0.0, min(float(settings["banner_bg_opacity"]), 1.0))
+        bg = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
+        ImageDraw.Draw(bg).rounded_rectangle((0, 0, self.width - 1, self.height - 1), radius=round(b * 0.25),
+                                             fill=(r, g, bl, round(opacity * 255)))
+        self.banner = _premultiplied(bg)
+
+def over(dst, src, x, y, opacity=1.0):
+    """Composite premultiplied ``src`` onto ``dst`` at integer (x, y), clipped to ``dst``."""
+    if opacity <= 0.0:
+        return
+    h, w = src.shape[:2]
+    x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, dst.shape[1]), min(y + h, dst.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    s = src[y0 - y:y1 - y, x0 - x:x1 - x]
+    if opacity < 1.0:
+        s = s * opacity
+    d = dst[y0:y1, x0:x1]
+    d *= 1.0 - s[..., 3:4]
+    d += s
+
+def gaussian_blur(img, sigma):
+    """CSS ``blur(sigma)`` on a premultiplied layer, done by Pillow in C.
+
+    Returns ``(image, pad)``: the image grows by ``pad`` on every side so the
+    blur can spread past the original edges.
+    """
+    if sigma < 0.3:
+        return img, 0
+    pad = math.ceil(sigma * 3)
+    h, w = img.shape[:2]
+    data = np.zeros((h + 2 * pad, w + 2 * pad, 4), np.uint8)
+    data[pad:pad + h, pad:pad + w] = img * 255 + 0.5
+    blurred = Image.frombuffer("RGBa", (w + 2 * pad, h + 2 * pad), data).filter(ImageFilter.GaussianBlur(sigma))
+    return np.multiply(np.asarray(blurred), 1 / 255, dtype=np.float32), pad
+
+def scaled(img, scale):
+    """Nearest-neighbour scale around the centre, keeping the array size."""
+    if abs(scale - 1.0) < 1e-3:
+        return img
+    h, w = img.shape[:2]
+    ys = np.clip(((np.arange(h) - h / 2) / scale + h / 2).astype(np.int32), 0, h - 1)
+    xs = np.clip(((np.arange(w) - w / 2) / scale + w / 2).astype(np.int32), 0, w - 1)
+    out = img[ys[:, None], xs]
+    if scale < 1.0:
+        # Rows and columns that map outside the source are empty.
+        y0, x0 = math.ceil(h / 2 * (1 - scale)), math.ceil(w / 2 * (1 - scale))
+        y1, x1 = math.floor(h / 2 * (1 + scale)) + 1, math.floor(w / 2 * (1 + scale)) + 1
+        out[:y0] = 0
+        out[y1:] = 0
+        out[:, :x0] = 0
+        out[:, x1:] = 0
+    return out
+
+def clipped(img, top=0.0, right=0.0, bottom=0.0, left=0.0):
+    """Apply an ``inset()`` clip given as fractions of the box."""
+    h, w = img.shape[:2]
+    out = img.copy()
+    out[: round(h * top)] = 0
+    out[h - round(h * bottom):] = 0
+    out[:, : round(w * left)] = 0
+    out[:, w - round(w * right):] = 0
+    return out
+
+def to_rgba8(layer):
+    """Straight-alpha 8-bit RGBA from a premultiplied float layer."""
+    alpha = layer[..., 3]
+    scale = np.zeros_like(alpha)
+    np.divide(255.0, alpha, out=scale, where=alpha > 0)
+    out = layer * scale[..., None]
+    out[..., 3] = alpha * 255.0
+    np.clip(out, 0.0, 255.0, out=out)
+    out += 0.5
+    return out.astype(np.uint8)
+
+def trimmed(img):
+    """``(img, x, y)``: ``img`` cut down to its visible pixels, at offset (x, y)."""
+    alpha = img[..., 3] > 0
+    rows, cols = np.flatnonzero(alpha.any(axis=1)), np.flatnonzero(alpha.any(axis=0))
+    if not len(rows):
+        return img[:0, :0], 0, 0
+    return img[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1], int(cols[0]), int(rows[0])
+
+class Compositor:
+    """Composites the frames of one export.
+
+    The stage is allocated once, big enough for the widest slide of the
+    loop, and each frame works in a view of it; blurred text and logo layers
+    are cached by blur radius.
+    """
+
+    def __init__(self, layers, state, viewport=CANVAS):
+        self.layers, self.state, self.viewport = layers, state, viewport
+        reach_x = max(float(np.abs(state[e]["translate_x"]).max()) for e in ("text", "logo"))
+        reach_y = max(float(np.abs(state[e]["translate_y"]).max()) for e in ("text", "logo"))
+        self._stage = np.zeros((layers.height + 2 * (STAGE_MARGIN + math.ceil(reach_y)),
+                                layers.width + 2 * (STAGE_MARGIN + math.ceil(reach_x)), 4), np.float32)
+        self._text = np.zeros((layers.text_size[1] + layers.underline.shape[0] * 2, layers.text_size[0], 4),
+                              np.float32)
+        self._frame = np.zeros((viewport[1], viewport[0], 4), np.uint8)
+        self._drawn = None
+        self._blurred = OrderedDict()
+
+    def _cached(self, key, make):
+        layer = self._blurred.get(key)
+        if layer is None:
+            layer = self._blurred[key] = make()
+            if len(self._blurred) > BLUR_CACHE:
+                self._blurred.popitem(last=False)
+        else:
+            self._blurred.move_to_end(key)
+        return layer
+
+    def _text_layer(self, s, sigma):
+        layers, text = self.layers, self._text
+        text.fill(0)
+        underline_w = round(layers.underline.shape[1] * s("underline", "scale_x"))
+        if underline_w > 0:
+            over(text, layers.underline[:, :underline_w], *layers.underline_pos, s("underline", "opacity"))
+        over(text, layers.brand, *layers.brand_pos)
+        if layers.tagline is not None:
+            tag = clipped(layers.tagline, right=s("tagline", "clip_right"), left=s("tagline", "clip_left"))
+            over(text, tag, *layers.tagline_pos, s("tagline", "opacity"))
+        return gaussian_blur(text, sigma)
+
+    def composite(self, i):
+        """Composite frame ``i`` of the loop.
+
+        Returns ``(stage, x, y)``: the premultiplied banner stage and where
+        its top-left corner lands on the ``viewport`` canvas. The stage may
+        share memory with the next frame's.
+        """
+        layers, state, viewport = self.layers, self.state, self.viewport
+
+        def s(element, prop):
+            return float(state[element][prop][i])
+
+        # Margins so slides and blur have room before the banner-level
+        # effects are applied; symmetric per axis so scaling stays centred.
+        mx = STAGE_MARGIN + round(max(abs(s("text", "translate_x")), abs(s("logo", "translate_x"))))
+        my = STAGE_MARGIN + round(max(abs(s("text", "translate_y")), abs(s("logo", "translate_y"))))
+        stage = self._stage[:layers.height + 2 * my, :layers.width + 2 * mx]
+        stage.fill(0)
+        over(stage, layers.banner, mx, my)
+
+        if s("text", "opacity") > 0.0:
+            sigma = round(s("text", "blur") / BLUR_STEP) * BLUR_STEP
+            key = ("text", sigma, round(layers.underline.shape[1] * s("underline", "scale_x")),
+                   *(round(s(e, p), 4) for e, p in (("underline", "opacity"), ("tagline", "clip_right"),
+                                                    ("tagline", "clip_left"), ("tagline", "opacity"))))
+            text, pad = self._cached(key, lambda: self._text_layer(s, sigma))
+            over(stage, text, mx + layers.text_pos[0] + round(s("text", "translate_x")) - pad,
+                 my + layers.text_pos[1] + round(s("text", "translate_y")) - pad, s("text", "opacity"))
+
+        stroke = clipped(layers.stroke, top=s("stroke", "clip_top"))
+        over(stage, stroke, mx + layers.stroke_pos[0], my + layers.stroke_pos[1], s("stroke", "opacity"))
+
+        if s("logo", "opacity") > 0.0:
+            sigma = round(s("logo", "blur") / BLUR_STEP) * BLUR_STEP
+            scale = round(s("logo", "scale"), 4)
+            logo, pad = self._cached(("logo", sigma, scale), lambda: gaussian_blur(scaled(layers.logo, scale), sigma))
+            over(stage, logo, mx + layers.logo_pos[0] + round(s("logo", "translate_x")) - pad,
+                 my + layers.logo_pos[1] + round(s("logo", "translate_y")) - pad, s("logo", "opacity"))
+
+        # Slides leave most of the stage empty; blur only what is drawn.
+        stage, dx, dy = trimmed(scaled(stage, s("banner", "scale")))
+        stage, pad = gaussian_blur(stage, s("banner", "blur"))
+        x = (viewport[0] - layers.width) // 2 - mx + dx - pad
+        y = (viewport[1] - layers.height) // 2 - my + dy - pad
+        x += round(s("banner", "translate_x") + s("hover", "translate_x"))
+        y += round(s("banner", "translate_y") + s("hover", "translate_y"))
+        opacity = s("banner", "opacity")
+        if opacity < 1.0:
+            stage = stage * opacity
+        return stage, x, y
+
+    def frame(self, i):
+        """Frame ``i`` as an 8-bit RGBA array the size of ``viewport``.
+
+        Only the banner's own box is converted; the rest of the canvas is
+        transparent anyway. The array is reused by the next call.
+        """
+        stage, x, y = self.composite(i)
+        frame, viewport = self._frame, self.viewport
+        if self._drawn is not None:
+            frame[self._drawn] = 0
+        h, w = stage.shape[:2]
+        x0, y0, x1, y1 = max(x, 0), max(y, 0), min(x + w, viewport[0]), min(y + h, viewport[1])
+        self._drawn = None
+        if x0 < x1 and y0 < y1:
+            self._drawn = (slice(y0, y1), slice(x0, x1))
+            frame[self._drawn] = to_rgba8(stage[y0 - y:y1 - y, x0 - x:x1 - x])
+        return frame
+
+_worker = {}
+
+def _init_worker(settings, font_path, fps, profile, viewport, out_dir):
+    timeline = Timeline.from_settings(settings)
+    _, state = timeline.sample(fps, profile=profile)
+    _worker.update(compositor=Compositor(Layers(settings, font_path, viewport), state, viewport), state=state,
+                   viewport=viewport, out_dir=Path(out_dir), blank=None)
+
+def _render_frames(indices):
+    w = _worker
+    for i in indices:
+        path = w["out_dir"] / f"frame_{i:05d}.png"
+        if float(w["state"]["banner"]["opacity"][i]) <= 0.0:
+            # Fully hidden frames are all identical: encode one and reuse it.
+            if w["blank"] is None:
+                w["blank"] = path
+                Image.new("RGBA", w["viewport"], (0, 0, 0, 0)).save(path, compress_level=1)
+            else:
+                shutil.copyfile(w["blank"], path)
+            continue
+        Image.fromarray(w["compositor"].frame(i), "RGBA").save(path, compress_level=1)
+    return len(indices)
+
+def encode_video(frames_dir, fps, fmt, output=None, count=None):
+    """Pack ``frame_%05d.png`` (the first ``count`` frames) into an alpha video with a local ffmpeg."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise FileNotFoundError("ffmpeg not found on PATH (needed for --video)")
+    output = Path(output or Path(frames_dir) / f"overlay.{fmt}")
+    cmd = [ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+           "-i", str(Path(frames_dir) / "frame_%05d.png"), *VIDEO_FORMATS[fmt]]
+    if count is not None:
+        cmd += ["-frames:v", str(count)]
+    cmd.append(str(output))
+    subprocess.run(cmd, check=True)
+    return output
+
+def export_frames(settings, output_dir, fps=60, profile=None, font_path=None, viewport=CANVAS,
+                  workers=None, video=None):
+    """Render one loop of the overlay to ``output_dir/frame_00000.png`` ...
+
+    ``settings`` are ``render_overlay`` keyword arguments (see
+    ``resolve_settings``). ``video`` may be ``"webm"`` or ``"mov"``.
+    Returns a dict with the frame count, seconds taken and the video path.
+    """
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Frames left from a longer export would otherwise run on after this one.
+    for stale in output_dir.glob("frame_*.png"):
+        stale.unlink()
+    profile = profile or settings.get("profile", "full")
+    count = Timeline.from_settings(settings).frame_count(fps)
+    workers = workers or os.cpu_count() or 1
+    init = (settings, font_path, fps, profile, viewport, str(output_dir))
+    # Contiguous chunks so each worker reuses its blank frame and warm caches.
+    parts = workers * 4
+    chunks = [c for c in (list(range(i * count // parts, (i + 1) * count // parts)) for i in range(parts)) if c]
+    if workers == 1:
+        _init_worker(*init)
+        done = sum(_render_frames(c) for c in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init) as pool:
+            done = sum(pool.map(_render_frames, chunks))
+    result = {"frames": done, "fps": fps, "dir": str(output_dir.resolve()), "video": None}
+    if video:
+        result["video"] = str(encode_video(output_dir, fps, video, count=count))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Render the overlay loop to PNG frames / alpha video.")
+    parser.add_argument("--config", required=True, help="JSON file with render_overlay settings (logo_path required)")
+    parser.add_argument("--out", default="overlay_frames", help="folder for the PNG sequence")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--size", default="%dx%d" % CANVAS, help="canvas size, e.g. 1920x1080")
+    parser.add_argument("--font-file", help="TTF/OTF to draw text with (default: the installed font family)")
+    parser.add_argument("--profile", choices=sorted(PROFILES))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--video", choices=sorted(VIDEO_FORMATS), help="also encode an alpha video with ffmpeg")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as f:
+        settings = json.load(f)
+    if settings.get("logo_path"):
+        settings["logo_path"] = str(Path(args.config).parent / settings["logo_path"])
+    settings = resolve_settings(settings)
+    viewport = tuple(int(v) for v in args.size.lower().split("x"))
+    result = export_frames(settings, args.out, fps=args.fps, profile=args.profile, font_path=args.font_file,
+                           viewport=viewport, workers=args.workers, video=args.video)
+    loop = result["frames"] / result["fps"]
+    print(f"{result['frames']} frames ({loop:.1f}s loop) in {result['seconds']:.1f}s -> {result['dir']}")
+    if result["video"]:
+        print(result["video"])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
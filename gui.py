@@ -0,0 +1,616 @@
+import threading
+import tkinter
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import customtkinter as ctk
+from tkinter import filedialog, messagebox, colorchooser
+from tkinter import font as tkfont
+from fonts import font_families, primary_family
+from overlay_core import DEFAULTS, PROFILES, RENDER_OPTIONS, RenderCancelled, make_css_font_stack, render_overlay
+from project import load_project, save_preset
+
+POLL_MS = 50
+# Setting changes within this window reach the live preview as one push.
+PREVIEW_MS = 30
+
+class FontPicker(ctk.CTkFrame):
+    """Font family entry with a type-to-filter dropdown.
+
+    The dropdown only ever has ROWS row widgets; scrolling and filtering
+    relabel them, so thousands of families cost nothing until shown.
+    """
+    ROWS = 12
+    ROW_HEIGHT = 26
+
+    def __init__(self, master, variable, families):
+        super().__init__(master, fg_color="transparent")
+        self.variable = variable
+        self.families = list(families)
+        self._folded = [f.casefold() for f in self.families]
+        self.matches = self.families
+        self.top = 0
+        self.active = 0
+        self._query = variable.get().casefold()
+        self._popup = None
+        self.columnconfigure(0, weight=1)
+        self.entry = ctk.CTkEntry(self, textvariable=variable)
+        self.entry.grid(row=0, column=0, sticky="we")
+        ctk.CTkButton(self, text="▾", width=32, command=self.toggle).grid(row=0, column=1, padx=(6, 0))
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.entry.bind("<Return>", lambda e: self._choose(self.active))
+        self.entry.bind("<Escape>", lambda e: self.close())
+        self.entry.bind("<FocusOut>", self._close_soon)
+        self._configure_id = None
+
+    def filter(self, text):
+        query = text.strip().casefold()
+        if query:
+            hits = [i for i, name in enumerate(self._folded) if query in name]
+            # Stable sort: names starting with the query first, each group alphabetical.
+            hits.sort(key=lambda i: not self._folded[i].startswith(query))
+            self.matches = [self.families[i] for i in hits]
+        else:
+            self.matches = self.families
+        self.top = self.active = 0
+        self._draw()
+
+    def toggle(self):
+        if self._popup is not None:
+            self.close()
+            return
+        self.matches = self.families
+        current = self.variable.get().casefold()
+        self.active = next((i for i, name in enumerate(self._folded) if name == current), 0)
+        self.open()
+        self._scroll_to(self.active - self.ROWS // 2)
+        self.entry.focus_set()
+
+    def open(self):
+        if self._popup is None:
+            popup = self._popup = tkinter.Toplevel(self)
+            popup.wm_overrideredirect(True)
+            frame = ctk.CTkFrame(popup, corner_radius=0)
+            frame.pack(fill="both", expand=True)
+            frame.columnconfigure(0, weight=1)
+            self._rows = []
+            for i in range(self.ROWS):
+                row = ctk.CTkButton(frame, text="", anchor="w", height=self.ROW_HEIGHT, corner_radius=0,
+                                    fg_color="transparent", command=lambda i=i: self._choose(self.top + i))
+                row.grid(row=i, column=0, sticky="we")
+                self._rows.append(row)
+            self._scrollbar = ctk.CTkScrollbar(frame, command=self._on_scroll)
+            self._scrollbar.grid(row=0, column=1, rowspan=self.ROWS, sticky="ns")
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                popup.bind(sequence, self._on_wheel)
+            popup.bind("<FocusOut>", self._close_soon)
+            self._draw()
+            popup.update_idletasks()
+            x, y = self.winfo_rootx(), self.winfo_rooty() + self.winfo_height()
+            popup.geometry(f"{self.winfo_width()}x{popup.winfo_reqheight()}+{x}+{y}")
+            # The popup is placed in screen coordinates, so it closes when the
+            # window moves or resizes.
+            self._configure_id = self.winfo_toplevel().bind("<Configure>", self._on_configure, add="+")
+        self._popup.lift()
+
+    def close(self):
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+        if self._configure_id is not None:
+            # Widget.unbind(sequence, funcid) drops every binding of the
+            # sequence before Python 3.13; keep the toplevel's other ones.
+            top = self.winfo_toplevel()
+            script = top.bind("<Configure>")
+            top.bind("<Configure>", "\n".join(line for line in script.splitlines() if self._configure_id not in line))
+            top.deletecommand(self._configure_id)
+            self._configure_id = None
+
+    def _on_configure(self, event):
+        # Bound on the toplevel, so this also fires for every child widget.
+        if event.widget is self.winfo_toplevel():
+            self.close()
+
+    def _draw(self):
+        if self._popup is None:
+            return
+        highlight = ctk.ThemeManager.theme["CTkButton"]["fg_color"]
+        count = len(self.matches)
+        for i, row in enumerate(self._rows):
+            index = self.top + i
+            if index < count:
+                row.configure(text=self.matches[index], state="normal",
+                              fg_color=highlight if index == self.active else "transparent")
+            else:
+                row.configure(text="", state="disabled", fg_color="transparent")
+        if count:
+            self._scrollbar.set(self.top / count, min(1.0, (self.top + self.ROWS) / count))
+        else:
+            self._scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, top):
+        self.top = max(0, min(top, len(self.matches) - self.ROWS))
+        self._draw()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(round(float(amount) * len(self.matches)))
+        else:
+            self._scroll_to(self.top + int(amount) * (self.ROWS if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        down = event.num == 5 or event.delta < 0
+        self._scroll_to(self.top + (3 if down else -3))
+
+    def _move(self, step):
+        self.open()
+        if self.matches:
+            self.active = max(0, min(self.active + step, len(self.matches) - 1))
+            if self.active < self.top:
+                self.top = self.active
+            elif self.active >= self.top + self.ROWS:
+                self.top = self.active - self.ROWS + 1
+            self._draw()
+        return "break"
+
+    def _choose(self, index):
+        if 0 <= index < len(self.matches):
+            self.variable.set(self.matches[index])
+            self._query = self.variable.get().casefold()
+            self.entry.icursor("end")
+        self.close()
+        return "break"
+
+    def _on_key(self, event):
+        # Arrow keys, Return and the like leave the text alone.
+        query = self.variable.get().casefold()
+        if query == self._query:
+            return
+        self._query = query
+        self.open()
+        self.filter(query)
+
+    def _close_soon(self, _=None):
+        # Clicking a row can move focus to the popup first; only close once
+        # focus has left the picker altogether.
+        self.after(150, self._close_if_unfocused)
+
+    def _close_if_unfocused(self):
+        try:
+            focus = self.focus_get()
+        except (KeyError, tkinter.TclError):
+            focus = None
+        if focus is None or not str(focus).startswith(str(self)):
+            self.close()
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("blue")
+        self.title("Overlay Builder")
+        self.geometry("1140x1000")
+
+        try:
+            # The font catalog: only font folders changed since last start get rescanned.
+            available_fonts = list(font_families())
+        except ImportError:
+            available_fonts = []
+        if not available_fonts:
+            # No fontTools to build the catalog with: ask Tk (slow with thousands of fonts).
+            available_fonts = sorted(set(tkfont.families()), key=str.casefold)
+        default_font = "Segoe UI" if "Segoe UI" in available_fonts else ("Inter" if "Inter" in available_fonts else (available_fonts[0] if available_fonts else "ui-sans-serif"))
+
+        self.logo_path = ctk.StringVar(value="")
+        self.output_dir = ctk.StringVar(value="overlay_project_gui")
+        self.brand_text = ctk.StringVar(value=DEFAULTS["brand_text"])
+        self.tagline_text = ctk.StringVar(value=DEFAULTS["tagline_text"])
+        self.show_tagline = ctk.BooleanVar(value=DEFAULTS["show_tagline"])
+
+        self.in_duration = ctk.DoubleVar(value=DEFAULTS["in_duration"])
+        self.sustain_duration = ctk.DoubleVar(value=DEFAULTS["sustain_duration"])
+        self.out_duration = ctk.DoubleVar(value=DEFAULTS["out_duration"])
+
+        self.text_in_anim = ctk.DoubleVar(value=DEFAULTS["text_in_anim"])
+        self.logo_in_anim = ctk.DoubleVar(value=DEFAULTS["logo_in_anim"])
+
+        self.text_in_px = ctk.IntVar(value=DEFAULTS["text_in_px"])
+        self.logo_in_px = ctk.IntVar(value=DEFAULTS["logo_in_px"])
+        self.text_out_px = ctk.IntVar(value=DEFAULTS["text_out_px"])
+        self.logo_out_px = ctk.IntVar(value=DEFAULTS["logo_out_px"])
+
+        self.accent_color = ctk.StringVar(value=DEFAULTS["accent_color"])
+        self.text_color = ctk.StringVar(value=DEFAULTS["text_color"])
+        self.muted_color = ctk.StringVar(value=DEFAULTS["muted_color"])
+
+        self.brand_size_css = ctk.StringVar(value=DEFAULTS["brand_size_css"])
+        self.container_max_w = ctk.StringVar(value=DEFAULTS["container_max_w"])
+
+        self.stroke_scale = ctk.DoubleVar(value=DEFAULTS["stroke_scale"])
+        self.stroke_reveal_seconds = ctk.DoubleVar(value=DEFAULTS["stroke_reveal_seconds"])
+        self.stroke_hide_seconds = ctk.DoubleVar(value=DEFAULTS["stroke_hide_seconds"])
+
+        self.font_choice = ctk.StringVar(value=default_font)
+        self.available_fonts = available_fonts
+
+        self.banner_bg_hex = ctk.StringVar(value=DEFAULTS["banner_bg_hex"])
+        self.banner_bg_opacity = ctk.DoubleVar(value=DEFAULTS["banner_bg_opacity"])
+
+        self.underline_delay_seconds = ctk.DoubleVar(value=DEFAULTS["underline_delay_seconds"])
+        self.underline_duration_seconds = ctk.DoubleVar(value=DEFAULTS["underline_duration_seconds"])
+
+        self.tagline_reveal_seconds = ctk.DoubleVar(value=DEFAULTS["tagline_reveal_seconds"])
+        self.tagline_hide_seconds = ctk.DoubleVar(value=DEFAULTS["tagline_hide_seconds"])
+
+        self.enable_hover = ctk.BooleanVar(value=DEFAULTS["enable_hover"])
+        self.hover_x_px = ctk.IntVar(value=DEFAULTS["hover_x_px"])
+        self.hover_y_px = ctk.IntVar(value=DEFAULTS["hover_y_px"])
+
+        self.optimize_logo = ctk.BooleanVar(value=False)
+        self.stroke_asset = ctk.BooleanVar(value=False)
+        self.single_file = ctk.BooleanVar(value=False)
+        self.embed_font = ctk.BooleanVar(value=False)
+        self.profile = ctk.StringVar(value=DEFAULTS["profile"])
+
+        self.columnconfigure((0,1,2,3), weight=1, uniform="a")
+
+        pad = {"padx":12, "pady":8}
+
+        ctk.CTkLabel(self, text="Logo").grid(row=0, column=0, sticky="e", **pad)
+        self.logo_entry = ctk.CTkEntry(self, textvariable=self.logo_path, width=520)
+        self.logo_entry.grid(row=0, column=1, columnspan=2, sticky="we", **pad)
+        ctk.CTkButton(self, text="Browse", command=self.pick_logo).grid(row=0, column=3, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Output Folder").grid(row=1, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.output_dir).grid(row=1, column=1, columnspan=2, sticky="we", **pad)
+        ctk.CTkButton(self, text="Choose", command=self.pick_output).grid(row=1, column=3, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Brand Text").grid(row=2, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.brand_text).grid(row=2, column=1, columnspan=2, sticky="we", **pad)
+
+        profile_row = ctk.CTkFrame(self, fg_color="transparent")
+        profile_row.grid(row=2, column=3, sticky="w", **pad)
+        ctk.CTkLabel(profile_row, text="Profile").grid(row=0, column=0, padx=(0, 8))
+        ctk.CTkOptionMenu(profile_row, variable=self.profile, values=list(PROFILES), width=110).grid(row=0, column=1)
+
+        ctk.CTkLabel(self, text="Tagline").grid(row=3, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.tagline_text).grid(row=3, column=1, sticky="we", **pad)
+        ctk.CTkCheckBox(self, text="Show Tagline", variable=self.show_tagline).grid(row=3, column=2, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Font").grid(row=4, column=0, sticky="e", **pad)
+        self.font_picker = FontPicker(self, self.font_choice, self.available_fonts or ["ui-sans-serif"])
+        self.font_picker.grid(row=4, column=1, columnspan=2, sticky="we", **pad)
+        ctk.CTkCheckBox(self, text="Optimize Logo", variable=self.optimize_logo).grid(row=4, column=3, sticky="w", **pad)
+        ctk.CTkCheckBox(self, text="Pre-render Outline", variable=self.stroke_asset).grid(row=3, column=3, sticky="w", **pad)
+        ctk.CTkCheckBox(self, text="Single HTML File", variable=self.single_file).grid(row=5, column=3, sticky="w", **pad)
+        ctk.CTkCheckBox(self, text="Embed Font", variable=self.embed_font).grid(row=6, column=3, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Fade In (s)").grid(row=5, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.in_duration, width=120).grid(row=5, column=1, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Hold (s)").grid(row=5, column=1, sticky="e", padx=(220,12), pady=8)
+        ctk.CTkEntry(self, textvariable=self.sustain_duration, width=120).grid(row=5, column=1, sticky="e", padx=(0,12), pady=8)
+        ctk.CTkLabel(self, text="Fade Out (s)").grid(row=5, column=2, sticky="w", **pad)
+        ctk.CTkEntry(self, textvariable=self.out_duration, width=120).grid(row=5, column=2, sticky="e", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Text In Anim (s)").grid(row=6, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.text_in_anim, width=120).grid(row=6, column=1, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Logo In Anim (s)").grid(row=6, column=2, sticky="w", **pad)
+        ctk.CTkEntry(self, textvariable=self.logo_in_anim, width=120).grid(row=6, column=2, sticky="e", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Accent Color (Underline/Stroke)").grid(row=7, column=0, sticky="e", **pad)
+        self.accent_entry = ctk.CTkEntry(self, textvariable=self.accent_color)
+        self.accent_entry.grid(row=7, column=1, sticky="we", **pad)
+        ctk.CTkButton(self, text="Pick", command=self.pick_accent_color).grid(row=7, column=2, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Text Color").grid(row=7, column=2, sticky="e", padx=(220,12), pady=8)
+        ctk.CTkEntry(self, textvariable=self.text_color, width=140).grid(row=7, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Muted Color").grid(row=8, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.muted_color).grid(row=8, column=1, sticky="we", **pad)
+
+        ctk.CTkLabel(self, text="Stroke Scale").grid(row=8, column=2, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.stroke_scale, width=120).grid(row=8, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Stroke Reveal (s)").grid(row=9, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.stroke_reveal_seconds, width=120).grid(row=9, column=1, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Stroke Hide (s)").grid(row=9, column=2, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.stroke_hide_seconds, width=120).grid(row=9, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Underline Delay (s)").grid(row=10, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.underline_delay_seconds, width=120).grid(row=10, column=1, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Underline Duration (s)").grid(row=10, column=2, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.underline_duration_seconds, width=120).grid(row=10, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Brand Size CSS").grid(row=11, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.brand_size_css).grid(row=11, column=1, sticky="we", **pad)
+
+        ctk.CTkLabel(self, text="Container Max Width").grid(row=11, column=2, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.container_max_w, width=160).grid(row=11, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Banner Color").grid(row=12, column=0, sticky="e", **pad)
+        self.banner_color_entry = ctk.CTkEntry(self, textvariable=self.banner_bg_hex)
+        self.banner_color_entry.grid(row=12, column=1, sticky="we", **pad)
+        ctk.CTkButton(self, text="Pick", command=self.pick_banner_color).grid(row=12, column=2, sticky="w", **pad)
+
+        ctk.CTkLabel(self, text="Banner Opacity (0–1)").grid(row=12, column=2, sticky="e", padx=(220,12), pady=8)
+        ctk.CTkEntry(self, textvariable=self.banner_bg_opacity, width=140).grid(row=12, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Tagline Reveal (s)").grid(row=13, column=0, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.tagline_reveal_seconds, width=120).grid(row=13, column=1, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Tagline Hide (s)").grid(row=13, column=2, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.tagline_hide_seconds, width=120).grid(row=13, column=3, sticky="we", padx=(0,24), pady=8)
+
+        ctk.CTkCheckBox(self, text="Enable Hover", variable=self.enable_hover).grid(row=14, column=0, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Hover X (px)").grid(row=14, column=1, sticky="e", **pad)
+        ctk.CTkEntry(self, textvariable=self.hover_x_px, width=100).grid(row=14, column=2, sticky="w", **pad)
+        ctk.CTkLabel(self, text="Hover Y (px)").grid(row=14, column=2, sticky="e", padx=(220,12), pady=8)
+        ctk.CTkEntry(self, textvariable=self.hover_y_px, width=100).grid(row=14, column=3, sticky="w", padx=(0,24), pady=8)
+
+        ctk.CTkLabel(self, text="Slide Distances (px) — TextIn, LogoIn, TextOut, LogoOut").grid(row=15, column=0, columnspan=4, sticky="w", padx=12, pady=(14,6))
+        f = ctk.CTkFrame(self)
+        f.grid(row=16, column=0, columnspan=4, sticky="we", padx=12, pady=(0,12))
+        f.columnconfigure((0,1,2,3), weight=1)
+        ctk.CTkEntry(f, textvariable=self.text_in_px, width=100).grid(row=0, column=0, padx=6, pady=10)
+        ctk.CTkEntry(f, textvariable=self.logo_in_px, width=100).grid(row=0, column=1, padx=6, pady=10)
+        ctk.CTkEntry(f, textvariable=self.text_out_px, width=100).grid(row=0, column=2, padx=6, pady=10)
+        ctk.CTkEntry(f, textvariable=self.logo_out_px, width=100).grid(row=0, column=3, padx=6, pady=10)
+
+        actions = ctk.CTkFrame(self, fg_color="transparent")
+        actions.grid(row=17, column=0, columnspan=4, pady=16)
+        ctk.CTkButton(actions, text="Generate Overlay", command=self.generate).grid(row=0, column=0, padx=6)
+        self.cancel_button = ctk.CTkButton(actions, text="Cancel", command=self.cancel, state="disabled", width=100)
+        self.cancel_button.grid(row=0, column=1, padx=6)
+        ctk.CTkButton(actions, text="Live Preview", command=self.open_preview, width=120).grid(row=0, column=2, padx=6)
+        ctk.CTkButton(actions, text="Save Preset…", command=self.save_preset, width=120).grid(row=0, column=3, padx=6)
+        ctk.CTkButton(actions, text="Load Preset…", command=self.load_preset, width=120).grid(row=0, column=4, padx=6)
+
+        self.progress = ctk.CTkProgressBar(self)
+        self.progress.set(0)
+        self.progress.grid(row=18, column=0, columnspan=4, sticky="we", padx=24)
+        self.status = ctk.CTkLabel(self, text="")
+        self.status.grid(row=19, column=0, columnspan=4, sticky="w", padx=24, pady=(4, 12))
+
+        # One background worker: renders never block the Tk loop, and
+        # repeated clicks while it is busy collapse into a single rerun.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        self._pending = None
+        self._cancel = threading.Event()
+        self._progress = ("", 0.0)
+        self._report = {}
+
+        # Live preview: every settings variable pushes to the preview server
+        # (once it has been opened), batched by PREVIEW_MS.
+        self._preview = None
+        self._preview_after = None
+        for var in list(vars(self).values()):
+            if isinstance(var, tkinter.Variable):
+                var.trace_add("write", self._schedule_preview)
+
+    def pick_logo(self):
+        p = filedialog.askopenfilename(title="Select logo", filetypes=[("Images","*.png;*.jpg;*.jpeg;*.webp;*.gif"),("All files","*.*")])
+        if p:
+            self.logo_path.set(p)
+
+    def pick_output(self):
+        p = filedialog.askdirectory(title="Choose output folder")
+        if p:
+            self.output_dir.set(p)
+
+    def pick_accent_color(self):
+        initial = self.accent_color.get() if self.accent_color.get() else "#00C2FF"
+        rgb, hexval = colorchooser.askcolor(title="Choose Accent/Outline Color", initialcolor=initial)
+        if hexval:
+            self.accent_color.set(hexval)
+            self.accent_entry.delete(0, "end")
+            self.accent_entry.insert(0, hexval)
+
+    def pick_banner_color(self):
+        initial = self.banner_bg_hex.get() if self.banner_bg_hex.get() else "#000000"
+        rgb, hexval = colorchooser.askcolor(title="Choose Banner Color", initialcolor=initial)
+        if hexval:
+            self.banner_bg_hex.set(hexval)
+            self.banner_color_entry.delete(0, "end")
+            self.banner_color_entry.insert(0, hexval)
+
+    def collect_settings(self):
+        outdir = Path(self.output_dir.get()) if self.output_dir.get() else Path("overlay_project_gui")
+        font_stack = make_css_font_stack(self.font_choice.get())
+        return dict(
+            logo_path=self.logo_path.get(),
+            output_dir=outdir,
+            brand_text=self.brand_text.get(),
+            tagline_text=self.tagline_text.get(),
+            show_tagline=self.show_tagline.get(),
+            in_duration=float(self.in_duration.get()),
+            sustain_duration=float(self.sustain_duration.get()),
+            out_duration=float(self.out_duration.get()),
+            text_in_anim=float(self.text_in_anim.get()),
+            logo_in_anim=float(self.logo_in_anim.get()),
+            text_in_px=int(self.text_in_px.get()),
+            logo_in_px=int(self.logo_in_px.get()),
+            text_out_px=int(self.text_out_px.get()),
+            logo_out_px=int(self.logo_out_px.get()),
+            accent_color=self.accent_color.get(),
+            text_color=self.text_color.get(),
+            muted_color=self.muted_color.get(),
+            brand_size_css=self.brand_size_css.get(),
+            container_max_w=self.container_max_w.get(),
+            stroke_scale=float(self.stroke_scale.get()),
+            stroke_reveal_seconds=float(self.stroke_reveal_seconds.get()),
+            stroke_hide_seconds=float(self.stroke_hide_seconds.get()),
+            font_family_css=font_stack,
+            banner_bg_hex=self.banner_bg_hex.get(),
+            banner_bg_opacity=float(self.banner_bg_opacity.get()),
+            underline_delay_seconds=float(self.underline_delay_seconds.get()),
+            underline_duration_seconds=float(self.underline_duration_seconds.get()),
+            tagline_reveal_seconds=float(self.tagline_reveal_seconds.get()),
+            tagline_hide_seconds=float(self.tagline_hide_seconds.get()),
+            enable_hover=bool(self.enable_hover.get()),
+            hover_x_px=int(self.hover_x_px.get()),
+            hover_y_px=int(self.hover_y_px.get()),
+            profile=self.profile.get(),
+            optimize_logo=bool(self.optimize_logo.get()),
+            stroke_asset=bool(self.stroke_asset.get()),
+            single_file=bool(self.single_file.get()),
+            embed_font=bool(self.embed_font.get())
+        )
+
+    def generate(self):
+        if not self.logo_path.get():
+            messagebox.showerror("Error", "Select a logo file")
+            return
+        try:
+            settings = self.collect_settings()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if self._job is not None:
+            # Coalesce: only the newest request runs once the current one ends.
+            self._pending = settings
+            return
+        self._start(settings)
+
+    def _start(self, settings):
+        self._cancel.clear()
+        self._progress = ("starting", 0.0)
+        self._report = {}
+        self.progress.set(0)
+        self.cancel_button.configure(state="normal")
+        self._job = self._executor.submit(render_overlay, **settings, incremental=True,
+                                          report=self._report, progress=self._on_progress)
+        self.after(POLL_MS, self._poll)
+
+    def _on_progress(self, stage, fraction):
+        # Runs on the worker thread: never touch Tk here, just leave a note
+        # for _poll and bail out if the user cancelled. By "done" the overlay
+        # is written, so a late cancel is ignored rather than reported.
+        if self._cancel.is_set() and stage != "done":
+            raise RenderCancelled()
+        self._progress = (stage, fraction)
+
+    def _poll(self):
+        stage, fraction = self._progress
+        self.progress.set(fraction)
+        queued = " (rerun queued)" if self._pending is not None else ""
+        self.status.configure(text=f"Generating… {stage}{queued}")
+        job = self._job
+        if not job.done():
+            self.after(POLL_MS, self._poll)
+            return
+        self._job = None
+        self.cancel_button.configure(state="disabled")
+        if self._pending is not None:
+            settings, self._pending = self._pending, None
+            self._start(settings)
+            return
+        try:
+            path = job.result()
+        except RenderCancelled:
+            self.progress.set(0)
+            self.status.configure(text="Cancelled")
+            return
+        except Exception as e:
+            self.progress.set(0)
+            self.status.configure(text="Failed")
+            messagebox.showerror("Error", str(e))
+            return
+        self.progress.set(1)
+        status = "Overlay generated at" if self._report["changed"] else "Overlay unchanged at"
+        self.status.configure(text=f"{status} {path}")
+        message = f"{status}:\n{path}"
+        logo = self._report.get("logo")
+        if logo:
+            message += (f"\n\nLogo optimized to {logo['output_size'][0]}×{logo['output_size'][1]}: "
+                        f"{logo['bytes_saved'] / 1024:.0f} KB smaller on disk, "
+                        f"{logo['decoded_bytes_saved'] / 2**20:.1f} MB less decoded in OBS")
+        messagebox.showinfo("Done", message)
+
+    def open_preview(self):
+        if self._preview is None:
+            from preview import PreviewServer
+            self._preview = PreviewServer().start()
+        self._push_preview()
+        webbrowser.open(self._preview.url)
+        self.status.configure(text=f"Live preview at {self._preview.url}")
+
+    def _schedule_preview(self, *_):
+        if self._preview is not None and self._preview_after is None:
+            self._preview_after = self.after(PREVIEW_MS, self._push_preview)
+
+    def _push_preview(self):
+        self._preview_after = None
+        try:
+            self._preview.update(self.collect_settings())
+        except (tkinter.TclError, ValueError):
+            # A field is mid-edit (e.g. an empty number); keep the last preview.
+            pass
+
+    def save_preset(self):
+        path = filedialog.asksaveasfilename(title="Save preset to project", defaultextension=".json",
+                                            filetypes=[("Overlay project", "*.json")], confirmoverwrite=False)
+        if not path:
+            return
+        name = ctk.CTkInputDialog(title="Save Preset", text="Preset name").get_input()
+        if not name or not name.strip():
+            return
+        try:
+            settings = self.collect_settings()
+            del settings["font_family_css"], settings["output_dir"]
+            settings["font"] = self.font_choice.get()
+            save_preset(path, name.strip(), settings)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.status.configure(text=f"Saved preset {name.strip()} to {path}")
+
+    def load_preset(self):
+        path = filedialog.askopenfilename(title="Load preset from project",
+                                          filetypes=[("Overlay project", "*.json *.toml"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            project = load_project(path)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        names = list(project.presets)
+        if len(names) == 1:
+            name = names[0]
+        else:
+            name = ctk.CTkInputDialog(title="Load Preset", text="Preset name:\n" + ", ".join(names)).get_input()
+        if not name:
+            return
+        if name.strip() not in project.presets:
+            messagebox.showerror("Error", f"No preset named {name.strip()!r} in {path}")
+            return
+        name = name.strip()
+        settings = project.presets[name]
+        # Settings the preset leaves out go back to their defaults.
+        for key in [*DEFAULTS, *RENDER_OPTIONS]:
+            var = getattr(self, key, None)
+            if isinstance(var, tkinter.Variable):
+                var.set(DEFAULTS.get(key, False))
+        for key, value in settings.items():
+            var = self.font_choice if key == "font" else getattr(self, key, None)
+            if isinstance(var, tkinter.Variable):
+                var.set(value)
+        if "font_family_css" in settings and "font" not in settings:
+            self.font_choice.set(primary_family(settings["font_family_css"]))
+        self.output_dir.set(str(project.output_dir / settings.get("output_dir", name)))
+        self.status.configure(text=f"Loaded preset {name} from {path}")
+
+    def cancel(self):
+        self._pending = None
+        self._cancel.set()
+        self.status.configure(text="Cancelling…")
+
+    def destroy(self):
+        self._pending = None
+        self._cancel.set()
+        self._executor.shutdown(wait=False)
+        if self._preview is not None:
+            self._preview.stop()
+        super().destroy()
@@ -0,0 +1,35 @@
+"""What the app's localhost HTTP servers (``preview``, ``service``) share."""
+from http.server import BaseHTTPRequestHandler
+
+LOOPBACK_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+class LocalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_body(self, data, content_type, status=200, headers=None):
+        """Answer with ``data``; responses are never cached since they follow live state."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def host_allowed(self, allowed):
+        """Whether the ``Host`` header names one of ``allowed``.
+
+        A page on another site can make the browser send requests here after
+        pointing its own DNS name at 127.0.0.1 (DNS rebinding); its ``Host``
+        header still carries that name.
+        """
+        host = self.headers.get("Host", "")
+        if host.startswith("["):
+            name = host[1:].partition("]")[0]
+        else:
+            name = host.rpartition(":")[0] if ":" in host else host
+        return name.lower() in allowed
+
+    def log_message(self, format, *args):
+        pass
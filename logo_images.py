@@ -0,0 +1,186 @@
+"""Pillow-based logo processing for exports: optimizing, outlines and atlases.
+
+Plain exports never touch Pillow; each step here loads it through
+``_pillow()`` when it runs.
+"""
+import io
+import math
+
+# OBS decodes the logo once for <img class="logo"> and once for the
+# .logoStroke mask, so every decoded pixel is paid for twice.
+LOGO_DECODES = 2
+
+# WebP encoder effort (0-6). Lossless output barely shrinks past 4 while 6
+# costs tens of times longer on large logos.
+WEBP_METHOD = 4
+
+def _pillow():
+    try:
+        from PIL import Image, ImageChops, ImageColor
+    except ImportError:
+        raise ImportError("Logo processing needs Pillow (pip install Pillow)") from None
+    return Image, ImageChops, ImageColor
+
+def image_size(path):
+    """(width, height) read from the image header, without decoding pixels."""
+    Image, _, _ = _pillow()
+    with Image.open(path) as img:
+        return img.size
+
+def _to_srgb_rgba(img):
+    icc = img.info.get("icc_profile")
+    if icc:
+        try:
+            from PIL import ImageCms
+        except ImportError:  # Pillow built without LittleCMS
+            return img.convert("RGBA")
+        try:
+            src = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+            dst = ImageCms.createProfile("sRGB")
+            mode = "RGBA" if img.mode in ("RGBA", "LA", "P", "PA") else "RGB"
+            img = ImageCms.profileToProfile(img.convert(mode), src, dst, outputMode=mode)
+        except (ImageCms.PyCMSError, OSError):
+            pass
+    return img.convert("RGBA")
+
+def fit_size(size, max_w, max_h):
+    """Largest size with the same aspect ratio inside ``max_w`` x ``max_h``; never upscales."""
+    w, h = size
+    scale = min(1.0, max_w / w, max_h / h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+def optimize_logo(src, max_w, max_h):
+    """Downsample ``src`` to fit ``max_w`` x ``max_h`` and re-encode it as lossless WebP.
+
+    Metadata is dropped and colors are converted to sRGB. Returns the encoded
+    bytes, or None for animated images, which are left untouched.
+    """
+    Image, _, _ = _pillow()
+    with Image.open(src) as img:
+        if getattr(img, "is_animated", False):
+            return None
+        img = _to_srgb_rgba(img)
+    target = fit_size(img.size, max_w, max_h)
+    if target != img.size:
+        img = img.resize(target, Image.LANCZOS, reducing_gap=3.0)
+    buf = io.BytesIO()
+    img.save(buf, "WEBP", lossless=True, quality=100, method=WEBP_METHOD)
+    return buf.getvalue()
+
+def stroke_padding(logo_h, stroke_scale):
+    """Outline thickness in pixels matching the old ``scale(stroke_scale)`` mask."""
+    return max(0, math.ceil((stroke_scale - 1.0) * logo_h / 2))
+
+def _dilate(alpha, radius):
+    # Disc-shaped max filter built from shifted copies: first the horizontal
+    # runs for every half-width, then one vertical pass per row offset. The
+    # image is padded by ``radius`` so ImageChops.offset only wraps zeros.
+    _, ImageChops, _ = _pillow()
+    runs = [alpha]
+    for k in range(1, radius + 1):
+        runs.append(ImageChops.lighter(runs[-1], ImageChops.lighter(
+            ImageChops.offset(alpha, k, 0), ImageChops.offset(alpha, -k, 0))))
+    out = runs[radius]
+    for dy in range(1, radius + 1):
+        row = runs[math.isqrt(radius * radius - dy * dy)]
+        out = ImageChops.lighter(out, ImageChops.lighter(
+            ImageChops.offset(row, 0, dy), ImageChops.offset(row, 0, -dy)))
+    return out
+
+def render_stroke(src, max_w, max_h, stroke_scale, color):
+    """Pre-render the logo outline as a solid ``color`` silhouette.
+
+    The logo is fitted into ``max_w`` x ``max_h``, its alpha is dilated by
+    ``stroke_padding`` and the canvas grows by that much on every side.
+    Returns lossless WebP bytes.
+    """
+    Image, _, ImageColor = _pillow()
+    try:
+        rgb = ImageColor.getrgb(color)[:3]
+    except ValueError:
+        raise ValueError(f"stroke asset needs a plain color, got {color!r}") from None
+    with Image.open(src) as img:
+        img = img.convert("RGBA")
+    size = fit_size(img.size, max_w, max_h)
+    alpha = img.resize(size, Image.LANCZOS).getchannel("A")
+    pad = stroke_padding(size[1], stroke_scale)
+    canvas = Image.new("L", (size[0] + 2 * pad, size[1] + 2 * pad), 0)
+    canvas.paste(alpha, (pad, pad))
+    stroke = Image.new("RGBA", canvas.size, rgb + (0,))
+    stroke.putalpha(_dilate(canvas, pad))
+    buf = io.BytesIO()
+    stroke.save(buf, "WEBP", lossless=True, quality=100, method=WEBP_METHOD)
+    return buf.getvalue()
+
+def stroke_inset(logo_size, stroke_size):
+    """How far (in % of the logo's height, width) the outline reaches past the logo box."""
+    (lw, lh), (sw, sh) = logo_size, stroke_size
+    return ((sh - lh) / 2 / lh * 100.0, (sw - lw) / 2 / lw * 100.0)
+
+def logo_display_box(brand_px, stroke_scale, density=2.0):
+    """Largest (width, height) in device pixels the overlay CSS can show the logo at.
+
+    The logo is ``--logo-h`` (1x brand size) tall, at most 6x brand size wide,
+    and the stroke mask scales it by ``stroke_scale`` on top of that.
+    """
+    scale = max(1.0, stroke_scale) * density
+    return math.ceil(brand_px * 6 * scale), math.ceil(brand_px * scale)
+
+# Widest atlas sheet; logos wrap onto a new row past this.
+ATLAS_MAX_W = 4096
+# Transparent gutter between atlas cells so filtering never bleeds a neighbour in.
+ATLAS_GAP = 2
+
+def atlas_layout(sizes, max_w, max_h):
+    """Pack logos of ``sizes`` (each fitted into ``max_w`` x ``max_h``) row by row.
+
+    Returns ``(sheet_size, boxes)`` with one ``(x, y, w, h)`` per logo.
+    """
+    boxes = []
+    x = y = row_h = sheet_w = 0
+    for size in sizes:
+        w, h = fit_size(size, max_w, max_h)
+        if x and x + w > ATLAS_MAX_W:
+            x, y, row_h = 0, y + row_h + ATLAS_GAP, 0
+        boxes.append((x, y, w, h))
+        x += w + ATLAS_GAP
+        row_h = max(row_h, h)
+        sheet_w = max(sheet_w, x - ATLAS_GAP)
+    return (sheet_w, y + row_h), boxes
+
+def logo_atlas(srcs, max_w, max_h):
+    """Fit every logo in ``srcs`` into ``max_w`` x ``max_h`` and pack them into one sheet.
+
+    Cells are placed by ``atlas_layout``; animated images contribute their
+    first frame. Returns lossless WebP bytes.
+    """
+    Image, _, _ = _pillow()
+    images = []
+    for src in srcs:
+        with Image.open(src) as img:
+            images.append(_to_srgb_rgba(img))
+    sheet_size, boxes = atlas_layout([img.size for img in images], max_w, max_h)
+    sheet = Image.new("RGBA", sheet_size, (0, 0, 0, 0))
+    for img, (x, y, w, h) in zip(images, boxes):
+        if (w, h) != img.size:
+            img = img.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+        sheet.paste(img, (x, y))
+    buf = io.BytesIO()
+    sheet.save(buf, "WEBP", lossless=True, quality=100, method=WEBP_METHOD)
+    return buf.getvalue()
+
+def savings_report(src_path, src_bytes, out_path, out_bytes):
+    sw, sh = image_size(src_path)
+    ow, oh = image_size(out_path)
+    src_decoded = sw * sh * 4 * LOGO_DECODES
+    out_decoded = ow * oh * 4 * LOGO_DECODES
+    return {
+        "source_size": [sw, sh],
+        "output_size": [ow, oh],
+        "source_bytes": src_bytes,
+        "output_bytes": out_bytes,
+        "bytes_saved": src_bytes - out_bytes,
+        "source_decoded_bytes": src_decoded,
+        "output_decoded_bytes": out_decoded,
+        "decoded_bytes_saved": src_decoded - out_decoded,
+    }
@@ -0,0 +1,939 @@
+"""Headless overlay renderer: templates, timeline math and file output.
+
+Nothing here imports Tk, so render boxes without a display (and scripts that
+only need ``render_overlay``) stay fast to start. Run ``python -m overlay_core
+--help`` for the command line interface.
+"""
+import ast
+import operator
+import os
+import posixpath
+import re
+import sys
+import time
+from pathlib import Path
+from functools import lru_cache
+from asset_store import AssetStore
+from sinks import DirectorySink
+from timeline import Timeline
+
+def hex_to_rgb(hex_str):
+    h = hex_str.strip().lstrip('#')
+    if len(h) == 3:
+        h = ''.join(c*2 for c in h)
+    if len(h) != 6:
+        return (0, 0, 0)
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+def make_css_font_stack(primary_name: str) -> str:
+    if not primary_name:
+        primary = 'ui-sans-serif'
+    else:
+        primary = f'"{primary_name}"' if " " in primary_name else primary_name
+    return f'{primary}, ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, Inter, Arial, "Noto Sans", "Helvetica Neue", sans-serif'
+
+# Every setting that feeds the generated HTML, with the type it is normalized to.
+RENDER_PARAMS = {
+    "brand_text": str,
+    "tagline_text": str,
+    "show_tagline": bool,
+    "in_duration": float,
+    "sustain_duration": float,
+    "out_duration": float,
+    "text_in_anim": float,
+    "logo_in_anim": float,
+    "text_in_px": int,
+    "logo_in_px": int,
+    "text_out_px": int,
+    "logo_out_px": int,
+    "accent_color": str,
+    "text_color": str,
+    "muted_color": str,
+    "brand_size_css": str,
+    "container_max_w": str,
+    "stroke_scale": float,
+    "stroke_reveal_seconds": float,
+    "stroke_hide_seconds": float,
+    "font_family_css": str,
+    "banner_bg_hex": str,
+    "banner_bg_opacity": float,
+    "underline_delay_seconds": float,
+    "underline_duration_seconds": float,
+    "tagline_reveal_seconds": float,
+    "tagline_hide_seconds": float,
+    "enable_hover": bool,
+    "hover_x_px": int,
+    "hover_y_px": int,
+    "profile": str,
+}
+
+# Template inputs worked out during export (asset paths and geometry) rather
+# than chosen by the user.
+TEMPLATE_EXTRAS = {
+    "logo_src": "assets/logo.png",
+    "stroke_src": None,
+    "stroke_inset": None,
+    "inline_logo": False,
+    "font_faces": None,
+}
+
+# Files an export may leave in assets/; ones the current settings do not use are deleted.
+ASSET_PATTERNS = ("logo.*", "logo-atlas.webp", "logo-stroke.webp")
+
+# Animation profiles: "full" is the original look; "lowcost" only animates
+# compositor-friendly properties (transform, opacity) for busy OBS scenes.
+PROFILES = ("full", "lowcost")
+
+# Export options that change how files are produced rather than the settings
+# baked into the HTML.
+RENDER_OPTIONS = {
+    "optimize_logo": bool,
+    "stroke_asset": bool,
+    "single_file": bool,
+    "minify": bool,
+    "embed_font": bool,
+}
+
+# Defaults used by the GUI and for any setting a batch row leaves out.
+DEFAULTS = {
+    "brand_text": "cody raves",
+    "tagline_text": "twitch.tv/cody_raves",
+    "show_tagline": True,
+    "in_duration": 4.0,
+    "sustain_duration": 10.0,
+    "out_duration": 4.0,
+    "text_in_anim": 1.6,
+    "logo_in_anim": 1.2,
+    "text_in_px": 280,
+    "logo_in_px": 280,
+    "text_out_px": 140,
+    "logo_out_px": 140,
+    "accent_color": "#00C2FF",
+    "text_color": "#FFFFFF",
+    "muted_color": "rgba(255,255,255,0.75)",
+    "brand_size_css": "clamp(20px, 5.2vmin, 64px)",
+    "container_max_w": "92vmin",
+    "stroke_scale": 1.18,
+    "stroke_reveal_seconds": 0.6,
+    "stroke_hide_seconds": 0.6,
+    "font_family_css": make_css_font_stack("Segoe UI"),
+    "banner_bg_hex": "#000000",
+    "banner_bg_opacity": 0.18,
+    "underline_delay_seconds": 0.15,
+    "underline_duration_seconds": 3.45,
+    "tagline_reveal_seconds": 0.7,
+    "tagline_hide_seconds": 0.5,
+    "enable_hover": True,
+    "hover_x_px": 8,
+    "hover_y_px": 4,
+    "profile": "full",
+}
+
+def check_profile(profile):
+    if profile not in PROFILES:
+        raise ValueError(f"unknown profile {profile!r} (expected one of: {', '.join(PROFILES)})")
+    return profile
+
+def coerce_param(name, value):
+    if name == "profile":
+        return check_profile(str(value).strip())
+    kind = RENDER_PARAMS.get(name) or RENDER_OPTIONS[name]
+    if kind is bool and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if kind is int:
+        return int(float(value))
+    return kind(value)
+
+class RenderCancelled(Exception):
+    """Raised from a ``progress`` callback to abandon a render."""
+
+class StageTimer:
+    """Progress callback wrapper that also times each stage.
+
+    Every call ends the stage before it; ``timings`` maps stage names to
+    seconds (the last stage named is not timed).
+    """
+
+    def __init__(self, progress=None, first="setup"):
+        self.timings = {}
+        self._progress = progress
+        self._stage, self._start = first, time.perf_counter()
+
+    def __call__(self, stage, fraction):
+        now = time.perf_counter()
+        self.timings[self._stage] = self.timings.get(self._stage, 0.0) + now - self._start
+        self._stage, self._start = stage, now
+        if self._progress is not None:
+            self._progress(stage, fraction)
+
+# OBS's default canvas; viewport units in the settings resolve against it.
+CANVAS = (1920, 1080)
+
+_LENGTH_RE = re.compile(r"(-?\d*\.?\d+)(px|vmin|vmax|vw|vh|rem|em|%)?")
+_CSS_FUNCS = {
+    "clamp": lambda lo, val, hi: max(lo, min(val, hi)),
+    "min": min,
+    "max": max,
+    "calc": lambda v: v,
+}
+_CSS_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+def css_length_px(value, viewport=CANVAS):
+    """Resolve a CSS length such as ``clamp(20px, 5.2vmin, 64px)`` to pixels.
+
+    Handles px, viewport units, em/rem (16px) and calc/min/max/clamp; ``%``
+    is taken against the viewport width.
+    """
+    w, h = viewport
+    units = {"px": 1, "vw": w / 100, "%": w / 100, "vh": h / 100, "vmin": min(w, h) / 100,
+             "vmax": max(w, h) / 100, "em": 16, "rem": 16, None: 1}
+    expr = _LENGTH_RE.sub(lambda m: repr(float(m.group(1)) * units[m.group(2)]), value.strip())
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"unsupported CSS length: {value!r}") from None
+    return float(_eval_css(tree.body, value))
+
+def _eval_css(node, source):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_eval_css(node.operand, source)
+    if isinstance(node, ast.BinOp) and type(node.op) in _CSS_OPS:
+        return _CSS_OPS[type(node.op)](_eval_css(node.left, source), _eval_css(node.right, source))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _CSS_FUNCS:
+        return _CSS_FUNCS[node.func.id](*(_eval_css(arg, source) for arg in node.args))
+    raise ValueError(f"unsupported CSS length: {source!r}")
+
+def cache_dir():
+    if os.environ.get("OVERLAY_BUILDER_CACHE"):
+        return Path(os.environ["OVERLAY_BUILDER_CACHE"])
+    base = os.environ.get("LOCALAPPDATA") or Path.home() / ".cache"
+    return Path(base) / "overlay-builder"
+
+@lru_cache(maxsize=None)
+def default_asset_store():
+    return AssetStore(cache_dir() / "assets")
+
+@lru_cache(maxsize=None)
+def overlay_template():
+    """The compiled Jinja template behind every overlay page, built once per process."""
+    from jinja2 import Template
+    return Template(HTML_TEMPLATE)
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8" />
+  <title>Overlay</title>
+  <style>
+    {%- if inline_logo %}
+    :root { --logo-img: url('{{ logo_src }}'); }
+    {%- endif %}
+    {%- for face in font_faces or () %}
+    {{ face }}
+    {%- endfor %}
+    html, body { height: 100%; }
+    body {
+      margin: 0;
+      background: transparent;
+      overflow: hidden;
+      font-family: {{ font_family_css }};
+      color: {{ text_color }};
+    }
+    .stage { position: fixed; inset: 0; display: grid; place-items: center; pointer-events: none; }
+
+    .hoverwrap {
+      --hx: {{ hx }}px;
+      --hy: {{ hy }}px;
+      animation: hoverCycle {{ total_duration }}s linear infinite;
+      will-change: transform;
+    }
+
+    .banner {
+      --brand-size: {{ brand_size_css }};
+      --pad-y: calc(var(--brand-size) * 0.30);
+      --pad-x: calc(var(--brand-size) * 0.55);
+      --radius: calc(var(--brand-size) * 0.25);
+      --logo-h: calc(var(--brand-size) * 1.0);
+      --uline: max(2px, calc(var(--brand-size) * 0.05));
+      position: relative;
+      display: inline-grid;
+      grid-auto-flow: column;
+      grid-auto-columns: max-content;
+      grid-template-columns: max-content max-content;
+      align-items: center;
+      column-gap: calc(var(--brand-size) * 0.45);
+      width: max-content;
+      max-width: {{ container_max_w }};
+      padding: var(--pad-y) var(--pad-x);
+      border-radius: var(--radius);
+      background: rgba({{ banner_r }}, {{ banner_g }}, {{ banner_b }}, {{ banner_opacity }});
+      {%- if not lowcost %}
+      backdrop-filter: blur(2px);
+      -webkit-backdrop-filter: blur(2px);
+      {%- endif %}
+      animation: bannerCycle {{ total_duration }}s cubic-bezier(.2,.7,0,1) infinite;
+      will-change: transform, opacity{{ wc_filter }};
+    }
+
+    .textblock { display: grid; row-gap: calc(var(--brand-size) * 0.18); animation: textCycle {{ total_duration }}s cubic-bezier(.2,.7,0,1) infinite; will-change: transform, opacity{{ wc_filter }}; }
+    .brandwrap { position: relative; display: inline-block; }
+    .brand { position: relative; z-index: 1; font-weight: 700; letter-spacing: 0.02em; font-size: var(--brand-size); line-height: 1.05; }
+    .underline { position: absolute; left: 0; right: 0; bottom: -0.08em; height: var(--uline); background: {{ accent_color }}; transform-origin: left center; z-index: 0; pointer-events: none; animation: underlineCycle {{ total_duration }}s cubic-bezier(.2,.7,0,1) infinite; will-change: transform, opacity; }
+
+    .tagline {
+      font-weight: 500;
+      letter-spacing: 0.02em;
+      font-size: clamp(12px, calc(var(--brand-size) * 0.42), 24px);
+      color: {{ muted_color }};
+      max-width: calc(var(--brand-size) * 20);
+      overflow-wrap: anywhere;
+      {%- if lowcost %}
+      overflow: hidden;
+      animation: taglineClipCycle {{ total_duration }}s linear infinite;
+      will-change: transform, opacity;
+    }
+    .tagInner { display: block; animation: taglineInnerCycle {{ total_duration }}s linear infinite; will-change: transform; }
+      {%- else %}
+      animation: taglineCycle {{ total_duration }}s linear infinite;
+      will-change: clip-path, opacity;
+    }
+      {%- endif %}
+
+    .logoWrap { position: relative; display: inline-grid; place-items: center; }
+    {%- if clip_stroke %}
+    /* Clipped outline: the wrapper slides down while its content slides up
+       by the same amount, so the visible band grows/shrinks like the inset()
+       wipe without repainting anything per frame. */
+    .strokeClip {
+      position: absolute; inset: -{{ stroke_inset[0]|round(4) }}% -{{ stroke_inset[1]|round(4) }}%; z-index: 0; overflow: hidden;
+      pointer-events: none;
+      animation: strokeClipCycle {{ total_duration }}s linear infinite;
+      will-change: transform, opacity;
+    }
+    .strokeImg { display: block; width: 100%; height: 100%; animation: strokeImgCycle {{ total_duration }}s linear infinite; will-change: transform; }
+    {%- if not stroke_src %}
+    .strokeMask {
+      background: {{ accent_color }};
+      -webkit-mask-image: {{ logo_url }}; mask-image: {{ logo_url }};
+      -webkit-mask-repeat: no-repeat; mask-repeat: no-repeat;
+      -webkit-mask-position: center; mask-position: center;
+      -webkit-mask-size: contain; mask-size: contain;
+    }
+    {%- endif %}
+    {%- else %}
+    .logoStroke {
+      position: absolute; inset: 0; z-index: 0; background: {{ accent_color }}; transform: scale({{ stroke_scale }});
+      -webkit-mask-image: {{ logo_url }}; mask-image: {{ logo_url }};
+      -webkit-mask-repeat: no-repeat; mask-repeat: no-repeat;
+      -webkit-mask-position: center; mask-position: center;
+      -webkit-mask-size: contain; mask-size: contain;
+      pointer-events: none;
+      animation: strokeCycle {{ total_duration }}s linear infinite;
+    }
+    {%- endif %}
+    .logo { position: relative; z-index: 1; height: var(--logo-h); width: auto; max-width: calc(var(--brand-size) * 6); object-fit: contain; animation: logoCycle {{ total_duration }}s cubic-bezier(.2,.7,0,1) infinite; will-change: transform, opacity{{ wc_filter }}; }
+    {%- if inline_logo %}
+    .logo { content: var(--logo-img); }
+    {%- endif %}
+
+    @keyframes bannerCycle {
+      0% { transform: translate3d(0, -{{ logo_out_px }}px, 0) scale(0.985); opacity: 0;{{ blur('8px') }} }
+      {{ p_text_in_end|round(4) }}% { transform: translate3d(0, 0, 0) scale(1); opacity: 1;{{ blur('0') }} }
+      {{ p_hold_end|round(4) }}% { transform: translate3d(0, 0, 0) scale(1); opacity: 1;{{ blur('0') }} }
+      100% { transform: translate3d(0, -{{ logo_out_px }}px, 0) scale(0.985); opacity: 0;{{ blur('8px') }} }
+    }
+
+    @keyframes textCycle {
+      0% { transform: translate3d(-{{ text_in_px }}px, 0, 0); opacity: 0;{{ blur('10px') }} }
+      {{ p_text_in_end|round(4) }}% { transform: translate3d(0, 0, 0); opacity: 1;{{ blur('0') }} }
+      {{ p_hold_end|round(4) }}% { transform: translate3d(0, 0, 0); opacity: 1;{{ blur('0') }} }
+      100% { transform: translate3d(0, -{{ text_out_px }}px, 0); opacity: 0;{{ blur('8px') }} }
+    }
+
+    @keyframes underlineCycle {
+      0% { transform: scaleX(0); opacity: 0; }
+      {{ (p_uline_start)|round(4) - 0.01 }}% { transform: scaleX(0); opacity: 0; }
+      {{ p_uline_start|round(4) }}% { transform: scaleX(0); opacity: 1; }
+      {{ p_uline_end|round(4) }}% { transform: scaleX(1); opacity: 1; }
+      {{ p_hold_end|round(4) }}% { transform: scaleX(1); opacity: 1; }
+      100% { transform: scaleX(0); opacity: 0; transform-origin: right center; }
+    }
+
+    {%- if lowcost %}
+
+    @keyframes taglineClipCycle {
+      0% { opacity: 0; transform: translateX(-100%); }
+      {{ (p_tag_reveal_start)|round(4) - 0.01 }}% { opacity: 0; transform: translateX(-100%); }
+      {{ p_tag_reveal_start|round(4) }}% { opacity: 1; transform: translateX(-100%); }
+      {{ p_tag_reveal_end|round(4) }}% { opacity: 1; transform: translateX(0); }
+      {{ (p_tag_hide_start)|round(4) - 0.01 }}% { opacity: 1; transform: translateX(0); }
+      {{ p_tag_hide_start|round(4) }}% { opacity: 1; transform: translateX(0); }
+      {{ p_tag_hide_end|round(4) }}% { opacity: 1; transform: translateX(100%); }
+      100% { opacity: 0; transform: translateX(100%); }
+    }
+
+    @keyframes taglineInnerCycle {
+      0% { transform: translateX(100%); }
+      {{ p_tag_reveal_start|round(4) }}% { transform: translateX(100%); }
+      {{ p_tag_reveal_end|round(4) }}% { transform: translateX(0); }
+      {{ p_tag_hide_start|round(4) }}% { transform: translateX(0); }
+      {{ p_tag_hide_end|round(4) }}% { transform: translateX(-100%); }
+      100% { transform: translateX(-100%); }
+    }
+    {%- else %}
+
+    @keyframes taglineCycle {
+      0% { opacity: 0; clip-path: inset(0 100% 0 0); }
+      {{ (p_tag_reveal_start)|round(4) - 0.01 }}% { opacity: 0; clip-path: inset(0 100% 0 0); }
+      {{ p_tag_reveal_start|round(4) }}% { opacity: 1; clip-path: inset(0 100% 0 0); }
+      {{ p_tag_reveal_end|round(4) }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ (p_tag_hide_start)|round(4) - 0.01 }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ p_tag_hide_start|round(4) }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ p_tag_hide_end|round(4) }}% { opacity: 1; clip-path: inset(0 0 0 100%); }
+      100% { opacity: 0; clip-path: inset(0 0 0 100%); }
+    }
+    {%- endif %}
+
+    @keyframes logoCycle {
+      0% { transform: translate3d({{ logo_in_px }}px, 0, 0) scale(0.985); opacity: 0;{{ blur('10px') }} }
+      {{ p_logo_in_start|round(4) }}% { transform: translate3d({{ logo_in_px }}px, 0, 0) scale(0.985); opacity: 0;{{ blur('10px') }} }
+      {{ p_logo_in_end|round(4) }}% { transform: translate3d(0, 0, 0) scale(1); opacity: 1;{{ blur('0') }} }
+      {{ p_hold_end|round(4) }}% { transform: translate3d(0, 0, 0) scale(1); opacity: 1;{{ blur('0') }} }
+      100% { transform: translate3d(0, -{{ logo_out_px }}px, 0) scale(0.985); opacity: 0;{{ blur('8px') }} }
+    }
+
+    /* Hover cycle: only active during the hold window; gentle loop */
+    @keyframes hoverCycle {
+      0% { transform: translate3d(0,0,0); }
+      {{ hover_start_p|round(4) }}% { transform: translate3d(0,0,0); }
+      {{ p_hover_q1|round(4) }}% { transform: translate3d(var(--hx), 0, 0); }
+      {{ p_hover_q2|round(4) }}% { transform: translate3d(0, var(--hy), 0); }
+      {{ p_hover_q3|round(4) }}% { transform: translate3d(calc(-1 * var(--hx)), 0, 0); }
+      {{ hover_end_p|round(4) }}% { transform: translate3d(0, calc(-1 * var(--hy)), 0); }
+      {{ hover_end_p|round(4) + 0.01 }}% { transform: translate3d(0,0,0); }
+      100% { transform: translate3d(0,0,0); }
+    }
+
+    {%- if clip_stroke %}
+
+    @keyframes strokeClipCycle {
+      0% { opacity: 0; transform: translateY(100%); }
+      {{ (p_stroke_reveal_start)|round(4) - 0.01 }}% { opacity: 0; transform: translateY(100%); }
+      {{ p_stroke_reveal_start|round(4) }}% { opacity: 1; transform: translateY(100%); }
+      {{ p_stroke_reveal_end|round(4) }}% { opacity: 1; transform: translateY(0); }
+      {{ (p_stroke_hide_start)|round(4) - 0.01 }}% { opacity: 1; transform: translateY(0); }
+      {{ p_stroke_hide_start|round(4) }}% { opacity: 1; transform: translateY(0); }
+      {{ p_stroke_hide_end|round(4) }}% { opacity: 0; transform: translateY(100%); }
+      100% { opacity: 0; transform: translateY(100%); }
+    }
+
+    @keyframes strokeImgCycle {
+      0% { transform: translateY(-100%); }
+      {{ p_stroke_reveal_start|round(4) }}% { transform: translateY(-100%); }
+      {{ p_stroke_reveal_end|round(4) }}% { transform: translateY(0); }
+      {{ p_stroke_hide_start|round(4) }}% { transform: translateY(0); }
+      {{ p_stroke_hide_end|round(4) }}% { transform: translateY(-100%); }
+      100% { transform: translateY(-100%); }
+    }
+    {%- else %}
+
+    @keyframes strokeCycle {
+      0% { opacity: 0; clip-path: inset(100% 0 0 0); }
+      {{ (p_stroke_reveal_start)|round(4) - 0.01 }}% { opacity: 0; clip-path: inset(100% 0 0 0); }
+      {{ p_stroke_reveal_start|round(4) }}% { opacity: 1; clip-path: inset(100% 0 0 0); }
+      {{ p_stroke_reveal_end|round(4) }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ (p_stroke_hide_start)|round(4) - 0.01 }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ p_stroke_hide_start|round(4) }}% { opacity: 1; clip-path: inset(0 0 0 0); }
+      {{ p_stroke_hide_end|round(4) }}% { opacity: 0; clip-path: inset(100% 0 0 0); }
+      100% { opacity: 0; clip-path: inset(100% 0 0 0); }
+    }
+    {%- endif %}
+
+    @media (max-width: 720px) { .banner { --brand-size: clamp(18px, 5.5vmin, 56px); } }
+  </style>
+</head>
+<body>
+  <div class="stage">
+    <div class="hoverwrap">
+      <div class="banner" role="img" aria-label="{{ brand_text }} {{ ('— ' + tagline_text) if (tagline_text and show_tagline) else '' }}">
+        <div class="textblock">
+          <div class="brandwrap">
+            <div class="brand">{{ brand_text }}</div>
+            <div class="underline"></div>
+          </div>
+          {% if show_tagline and tagline_text %}
+          {%- if lowcost %}
+          <div class="tagline"><span class="tagInner">{{ tagline_text }}</span></div>
+          {%- else %}
+          <div class="tagline">{{ tagline_text }}</div>
+          {%- endif %}
+          {% endif %}
+        </div>
+        <div class="logoWrap">
+          {%- if clip_stroke %}
+          {%- if stroke_src %}
+          <div class="strokeClip"><img class="strokeImg" src="{{ stroke_src }}" alt=""></div>
+          {%- else %}
+          <div class="strokeClip"><div class="strokeImg strokeMask"></div></div>
+          {%- endif %}
+          {%- else %}
+          <div class="logoStroke"></div>
+          {%- endif %}
+          <img class="logo"{% if not inline_logo %} src="{{ logo_src }}"{% endif %} alt="Logo">
+        </div>
+      </div>
+    </div>
+  </div>
+</body>
+</html>
+"""
+
+def resolve_settings(settings):
+    """Fill ``settings`` up from ``DEFAULTS`` into ``render_overlay`` keyword arguments.
+
+    Values are coerced to their declared types, ``font`` (a family name) is
+    expanded with ``make_css_font_stack`` and unknown keys raise ``TypeError``.
+    """
+    settings = dict(settings)
+    font = settings.pop("font", None)
+    if font is not None and "font_family_css" not in settings:
+        settings["font_family_css"] = make_css_font_stack(font)
+    unknown = set(settings) - set(RENDER_PARAMS) - set(RENDER_OPTIONS) - {"logo_path", "output_dir", "playlist"}
+    if unknown:
+        raise TypeError(f"unknown setting(s): {', '.join(sorted(unknown))}")
+    if not settings.get("logo_path") and not settings.get("playlist"):
+        raise ValueError("logo_path is required")
+    kwargs = dict(DEFAULTS)
+    kwargs.update({k: coerce_param(k, v) for k, v in settings.items() if k in RENDER_PARAMS or k in RENDER_OPTIONS})
+    kwargs["logo_path"] = settings.get("logo_path")
+    kwargs["output_dir"] = settings.get("output_dir", "overlay_project")
+    if settings.get("playlist"):
+        kwargs["playlist"] = settings["playlist"]
+    return kwargs
+
+def _render_html(logo_src,
+                 stroke_src,
+                 stroke_inset,
+                 inline_logo,
+                 font_faces,
+                 brand_text,
+                 tagline_text,
+                 show_tagline,
+                 in_duration,
+                 sustain_duration,
+                 out_duration,
+                 text_in_anim,
+                 logo_in_anim,
+                 text_in_px,
+                 logo_in_px,
+                 text_out_px,
+                 logo_out_px,
+                 accent_color,
+                 text_color,
+                 muted_color,
+                 brand_size_css,
+                 container_max_w,
+                 stroke_scale,
+                 stroke_reveal_seconds,
+                 stroke_hide_seconds,
+                 font_family_css,
+                 banner_bg_hex,
+                 banner_bg_opacity,
+                 underline_delay_seconds,
+                 underline_duration_seconds,
+                 tagline_reveal_seconds,
+                 tagline_hide_seconds,
+                 enable_hover,
+                 hover_x_px,
+                 hover_y_px,
+                 profile):
+    timeline = Timeline(in_duration, sustain_duration, out_duration, text_in_anim, logo_in_anim,
+                        stroke_reveal_seconds, stroke_hide_seconds, underline_delay_seconds,
+                        underline_duration_seconds, tagline_reveal_seconds, tagline_hide_seconds)
+
+    banner_r, banner_g, banner_b = hex_to_rgb(banner_bg_hex)
+    banner_opacity = max(0.0, min(float(banner_bg_opacity), 1.0))
+
+    # If hover disabled, zero-out amplitudes
+    hx = int(hover_x_px if enable_hover else 0)
+    hy = int(hover_y_px if enable_hover else 0)
+
+    check_profile(profile)
+    lowcost = profile == "lowcost"
+    # The low-cost profile animates transform and opacity only: blur is
+    # dropped, and the tagline/outline wipes use sliding clip wrappers
+    # instead of clip-path.
+    clip_stroke = bool(stroke_src) or lowcost
+    if clip_stroke and stroke_inset is None:
+        pad = max(0.0, (stroke_scale - 1.0) / 2 * 100.0)
+        stroke_inset = (pad, pad)
+    def blur(amount):
+        return "" if lowcost else f" filter: blur({amount});"
+
+    return overlay_template().render(
+        **timeline.css_percentages(),
+        lowcost=lowcost,
+        clip_stroke=clip_stroke,
+        blur=blur,
+        wc_filter="" if lowcost else ", filter",
+        logo_src=logo_src,
+        # Inlined, the logo is declared once as --logo-img and both the <img>
+        # and the outline mask refer to it.
+        inline_logo=inline_logo,
+        logo_url="var(--logo-img)" if inline_logo else f"url('{logo_src}')",
+        stroke_src=stroke_src,
+        stroke_inset=stroke_inset,
+        font_faces=font_faces,
+        brand_text=brand_text,
+        tagline_text=tagline_text,
+        show_tagline=show_tagline,
+        text_color=text_color,
+        muted_color=muted_color,
+        accent_color=accent_color,
+        container_max_w=container_max_w,
+        brand_size_css=brand_size_css,
+        stroke_scale=stroke_scale,
+        stroke_reveal_seconds=stroke_reveal_seconds,
+        stroke_hide_seconds=stroke_hide_seconds,
+        text_in_px=text_in_px,
+        logo_in_px=logo_in_px,
+        text_out_px=text_out_px,
+        logo_out_px=logo_out_px,
+        font_family_css=font_family_css,
+        banner_r=banner_r,
+        banner_g=banner_g,
+        banner_b=banner_b,
+        banner_opacity=banner_opacity,
+        hx=hx,
+        hy=hy
+    )
+
+@lru_cache(maxsize=256)
+def _cached_html(key, extras):
+    return _render_html(**dict(zip(TEMPLATE_EXTRAS, extras)), **dict(zip(RENDER_PARAMS, key)))
+
+def overlay_html(**params):
+    """Render the overlay HTML for the given settings.
+
+    Parameters are normalized to their declared types before lookup, so
+    repeat renders with equivalent settings come straight from the cache.
+    Anything in ``TEMPLATE_EXTRAS`` may be passed too and is part of the key.
+    Renders with an inlined logo bypass the cache so it never pins data URIs.
+    """
+    key = tuple(coerce_param(name, params[name]) for name in RENDER_PARAMS)
+    extras = tuple(params.get(name, default) for name, default in TEMPLATE_EXTRAS.items())
+    if params.get("inline_logo"):
+        return _render_html(**dict(zip(TEMPLATE_EXTRAS, extras)), **dict(zip(RENDER_PARAMS, key)))
+    return _cached_html(key, extras)
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{}:;,>])\s*")
+_STYLE_RE = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+
+def minify_css(css):
+    """Strip comments and optional whitespace from the overlay's CSS.
+
+    Only safe for the CSS this module generates: spaces around ``+``/``-``
+    (which ``calc()`` needs) are kept, and there are no descendant
+    ``:pseudo`` selectors whose space would matter.
+    """
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+def minify_html(html):
+    """``html`` with the ``<style>`` block run through ``minify_css``."""
+    return _STYLE_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+
+def between(html, start, end):
+    """The text of ``html`` between the first ``start`` and the ``end`` after it."""
+    return html.partition(start)[2].partition(end)[0]
+
+def data_uri(path):
+    import base64
+    import mimetypes
+    mime = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+    return f"data:{mime};base64," + base64.b64encode(Path(path).read_bytes()).decode("ascii")
+
+def render_overlay(logo_path,
+                   output_dir,
+                   brand_text,
+                   tagline_text,
+                   show_tagline,
+                   in_duration,
+                   sustain_duration,
+                   out_duration,
+                   text_in_anim,
+                   logo_in_anim,
+                   text_in_px,
+                   logo_in_px,
+                   text_out_px,
+                   logo_out_px,
+                   accent_color,
+                   text_color,
+                   muted_color,
+                   brand_size_css,
+                   container_max_w,
+                   stroke_scale,
+                   stroke_reveal_seconds,
+                   stroke_hide_seconds,
+                   font_family_css,
+                   banner_bg_hex,
+                   banner_bg_opacity,
+                   underline_delay_seconds,
+                   underline_duration_seconds,
+                   tagline_reveal_seconds,
+                   tagline_hide_seconds,
+                   enable_hover,
+                   hover_x_px,
+                   hover_y_px,
+                   profile="full",
+                   asset_store=None,
+                   incremental=False,
+                   report=None,
+                   progress=None,
+                   optimize_logo=False,
+                   stroke_asset=False,
+                   single_file=False,
+                   minify=False,
+                   embed_font=False,
+                   playlist=None,
+                   sink=None):
+    """Write ``overlay.html`` and the logo under ``assets/`` into ``output_dir``.
+
+    Files are replaced atomically. With ``incremental`` set, files whose
+    contents would not change are left alone so browser sources watching the
+    folder do not reload. If ``report`` is a dict it receives ``changed``, the
+    output-relative paths that were actually written, and ``timings``,
+    seconds spent per stage (setup, logo, stroke, font, compile, template,
+    html).
+
+    ``optimize_logo`` downsamples the logo to the largest size the CSS can
+    display (2x for HiDPI) and re-encodes it as ``assets/logo.webp``; the
+    bytes and decoded memory saved are reported under ``report["logo"]``.
+
+    ``stroke_asset`` pre-renders the outline as ``assets/logo-stroke.webp``
+    (the logo's alpha dilated to ``stroke_scale`` in ``accent_color``) and
+    animates it with transforms instead of a runtime mask and clip-path.
+
+    ``single_file`` writes ``overlay.html`` alone, with the logo (and outline)
+    inlined as data URIs; the logo is declared once and shared by the
+    ``<img>`` and the mask. ``minify`` strips comments and whitespace from
+    the CSS.
+
+    ``embed_font`` finds the installed file(s) for the first family in
+    ``font_family_css``, subsets them to the brand and tagline glyphs and
+    inlines them as WOFF2 ``@font-face`` rules; ``report["font"]`` lists the
+    files used and the embedded size.
+
+    ``playlist`` is a list of ``(brand_text, tagline_text, logo_path)``
+    tuples or dicts with those keys (missing ones fall back to the
+    arguments); the page then plays the entries one after another through
+    the same timeline, with their logos packed into ``assets/logo-atlas.webp``
+    (see ``playlist``). It cannot be combined with ``stroke_asset``, and
+    ``optimize_logo`` is implied.
+
+    ``sink`` (see ``sinks``) receives the files instead of the file system;
+    ``output_dir`` is then the overlay's folder inside it. The returned
+    location is the sink's.
+
+    ``progress(stage, fraction)`` is called before each stage; it may raise
+    ``RenderCancelled`` to stop before anything else is written.
+    """
+    values = locals()
+    step = StageTimer(progress)
+    check_profile(profile)
+    if playlist is not None:
+        from playlist import playlist_entries
+        if stroke_asset:
+            raise ValueError("stroke_asset cannot be combined with a playlist")
+        playlist = playlist_entries(playlist, logo_path, brand_text, tagline_text)
+        logo_paths = [entry["logo_path"] for entry in playlist]
+    else:
+        logo_paths = [logo_path]
+    for path in logo_paths:
+        if not Path(path).exists():
+            raise FileNotFoundError(str(Path(path).resolve()))
+    store = asset_store or default_asset_store()
+    if sink is None:
+        sink, prefix = DirectorySink(output_dir, store), ""
+    else:
+        prefix = posixpath.normpath(Path(output_dir).as_posix()).lstrip("/")
+        prefix = "" if prefix == "." else prefix
+    changed = []
+
+    step("logo", 0.1)
+    if playlist is not None:
+        logo, atlas_boxes, atlas_size = _logo_atlas(store, logo_paths, brand_size_css, stroke_scale)
+        logo_name = "logo-atlas.webp"
+    else:
+        logo = store.add(logo_path)
+        logo_name = "logo.png"
+    if optimize_logo and playlist is None:
+        optimized = _optimized_logo(store, logo_path, brand_size_css, stroke_scale)
+        if optimized is not None:
+            logo, logo_name = optimized, "logo.webp"
+            if report is not None:
+                from logo_images import savings_report
+                report["logo"] = savings_report(logo_path, Path(logo_path).stat().st_size,
+                                                logo, logo.stat().st_size)
+    stroke = None
+    if stroke_asset:
+        step("stroke", 0.4)
+        stroke, inset = _stroke_asset(store, logo_path, brand_size_css, stroke_scale, accent_color)
+
+    font_faces = None
+    if embed_font:
+        # Before anything is written, so a missing font leaves the output alone.
+        step("font", 0.5)
+        texts = [(brand_text, tagline_text)] if playlist is None else \
+            [(entry["brand_text"], entry["tagline_text"]) for entry in playlist]
+        font_faces, font_info = _embedded_font(store, font_family_css, "".join(t[0] for t in texts),
+                                               "".join(t[1] for t in texts), show_tagline)
+        if report is not None:
+            report["font"] = font_info
+
+    if single_file:
+        extras = {"logo_src": data_uri(logo), "inline_logo": True}
+        if stroke is not None:
+            extras.update(stroke_src=data_uri(stroke), stroke_inset=inset)
+        keep = set()
+    else:
+        extras = {"logo_src": _write_asset(sink, store, prefix, logo, logo_name, changed)}
+        keep = {logo_name}
+        if stroke is not None:
+            extras.update(stroke_src=_write_asset(sink, store, prefix, stroke, "logo-stroke.webp", changed),
+                          stroke_inset=inset)
+            keep.add("logo-stroke.webp")
+    changed += ["assets/" + name for name in sink.prune(posixpath.join(prefix, "assets"), keep, ASSET_PATTERNS)]
+    if font_faces is not None:
+        extras["font_faces"] = font_faces
+
+    if not overlay_template.cache_info().currsize:
+        # Once per process; timed apart so it does not hide in "template".
+        step("compile", 0.55)
+        overlay_template()
+    step("template", 0.6)
+    params = {name: values[name] for name in RENDER_PARAMS}
+    if playlist is not None:
+        from playlist import playlist_html
+        html = playlist_html(playlist, atlas_boxes, atlas_size, extras["logo_src"], extras.get("font_faces"), **params)
+    else:
+        html = overlay_html(**extras, **params)
+
+    if minify:
+        html = minify_html(html)
+
+    step("html", 0.8)
+    if sink.write(posixpath.join(prefix, "overlay.html"), html.encode("utf-8"), incremental):
+        changed.append("overlay.html")
+    step("done", 1.0)
+    if report is not None:
+        report["changed"] = changed
+        report["timings"] = step.timings
+    return sink.location(prefix)
+
+def _write_asset(sink, store, prefix, stored, name, changed):
+    # -> the path the HTML refers to the asset by, relative to the overlay.
+    path = sink.asset_path(prefix, name, store.digest(stored))
+    src = posixpath.relpath(path, prefix or ".")
+    if sink.write_asset(path, stored, store.digest(stored)):
+        changed.append(src)
+    return src
+
+def _stroke_asset(store, logo_path, brand_size_css, stroke_scale, accent_color):
+    import logo_images
+    box = logo_images.logo_display_box(css_length_px(brand_size_css), 1.0)
+    stroke = store.derived(logo_path, "stroke:%dx%d:%s:%s" % (box + (stroke_scale, accent_color)), ".webp",
+                           lambda: logo_images.render_stroke(logo_path, *box, stroke_scale, accent_color))
+    logo_size = logo_images.fit_size(logo_images.image_size(logo_path), *box)
+    inset = logo_images.stroke_inset(logo_size, logo_images.image_size(stroke))
+    return stroke, tuple(round(v, 4) for v in inset)
+
+def _logo_atlas(store, logo_paths, brand_size_css, stroke_scale):
+    import logo_images
+    box = logo_images.logo_display_box(css_length_px(brand_size_css), stroke_scale)
+    # One cell per distinct image; entries showing the same logo share it.
+    cells = {}
+    for path in logo_paths:
+        cells.setdefault(store.digest(path), path)
+    unique = list(cells.values())
+    sheet, cell_boxes = logo_images.atlas_layout([logo_images.image_size(p) for p in unique], *box)
+    by_digest = dict(zip(cells, cell_boxes))
+    boxes = [by_digest[store.digest(p)] for p in logo_paths]
+    # Keyed by the first logo's content; the rest go into the tag.
+    tag = "atlas:%dx%d:%s" % (box + (",".join(list(cells)[1:]),))
+    atlas = store.derived(unique[0], tag, ".webp", lambda: logo_images.logo_atlas(unique, *box))
+    return atlas, boxes, sheet
+
+def _embedded_font(store, font_family_css, brand_text, tagline_text, show_tagline):
+    import fonts
+    family = fonts.primary_family(font_family_css)
+    # Weights served by the same installed face share one subset.
+    by_face = {}
+    for weight, text in fonts.face_texts(brand_text, tagline_text, show_tagline).items():
+        face = fonts.find_font_file(family, weight)
+        if face is None:
+            raise FileNotFoundError(f"font {family!r} is not installed, so it cannot be embedded")
+        by_face.setdefault(face, set()).update(text)
+    faces, files, size = [], [], 0
+    for (path, number, weight), chars in sorted(by_face.items(), key=lambda item: str(item[0])):
+        text = "".join(sorted(chars))
+        woff2 = store.derived(path, "subset:%d:%s" % (number, text), ".woff2",
+                              lambda: fonts.subset_woff2(path, text, number))
+        data = woff2.read_bytes()
+        faces.append(fonts.font_face_css(family, data, weight))
+        files.append(path)
+        size += len(data)
+    return tuple(faces), {"family": family, "files": files, "bytes": size}
+
+def _optimized_logo(store, logo_path, brand_size_css, stroke_scale):
+    import logo_images
+    box = logo_images.logo_display_box(css_length_px(brand_size_css), stroke_scale)
+    return store.derived(logo_path, "optimize:%dx%d" % box, ".webp",
+                         lambda: logo_images.optimize_logo(logo_path, *box))
+
+def main(argv=None):
+    # Imported here so scripts that only render do not pay for them.
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="python -m overlay_core", description="Render an overlay without the GUI.")
+    parser.add_argument("--config", help="JSON file with any render_overlay settings (flags override it)")
+    parser.add_argument("--logo", dest="logo_path", help="logo image")
+    parser.add_argument("--out", dest="output_dir", help="output folder")
+    parser.add_argument("--font", help="font family name (expanded into a CSS font stack)")
+    parser.add_argument("--playlist", help="CSV/JSONL of brand_text, tagline_text, logo_path entries to rotate through")
+    for name, kind in RENDER_PARAMS.items():
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, metavar=kind.__name__.upper())
+    for name in RENDER_OPTIONS:
+        parser.add_argument("--" + name.replace("_", "-"), dest=name, action="store_const", const=True)
+    args = parser.parse_args(argv)
+
+    settings = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            settings.update(json.load(f))
+        if settings.get("logo_path"):
+            settings["logo_path"] = str(Path(args.config).parent / settings["logo_path"])
+        for entry in settings.get("playlist") or ():
+            if isinstance(entry, dict) and entry.get("logo_path"):
+                entry["logo_path"] = str(Path(args.config).parent / entry["logo_path"])
+    if args.playlist:
+        from batch import load_manifest
+        settings["playlist"] = load_manifest(args.playlist)
+    settings.update({k: v for k, v in vars(args).items() if v is not None and k not in ("config", "playlist")})
+    try:
+        path = render_overlay(**resolve_settings(settings), incremental=True)
+    except (OSError, TypeError, ValueError) as e:
+        parser.exit(1, f"error: {type(e).__name__}: {e}\n")
+    print(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
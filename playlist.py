@@ -0,0 +1,119 @@
+"""Sponsor rotation: several brand entries taking turns in one overlay page.
+
+Every entry gets the regular overlay markup and all of them share one
+stylesheet. The keyframes are stretched over N cycles with the motion in the
+first 1/N, and entry k runs k cycles behind (a negative animation-delay, so
+the rotation is in phase from the first frame). Outside its turn an entry is
+``visibility: hidden`` and paints nothing. The logos are packed into one
+atlas image and each entry shows its cell through background and mask
+size/position, so the page decodes a single image.
+"""
+import re
+
+from overlay_core import overlay_html
+from timeline import Timeline
+
+ENTRY_FIELDS = ("brand_text", "tagline_text", "logo_path")
+
+_KEYFRAMES_RE = re.compile(r"(@keyframes \w+ \{\n)(.*?)(\n *\})", re.S)
+_FRAME_RE = re.compile(r"(?m)^( *)(\d+(?:\.\d+)?)% (\{.*\})$")
+_DURATION_RE = re.compile(r"(animation: \w+ )(\d+(?:\.\d+)?)s")
+_LOGO_IMG_RE = re.compile(r'<img class="logo"[^>]*>')
+
+def playlist_entries(playlist, logo_path, brand_text, tagline_text):
+    """Normalize ``playlist`` into dicts holding every ``ENTRY_FIELDS`` key.
+
+    Entries are dicts or ``(brand_text, tagline_text, logo_path)`` tuples;
+    anything an entry leaves out (or sets to None) comes from the overlay's
+    own settings. An empty ``tagline_text`` hides the tagline for that entry.
+    """
+    entries = []
+    for i, entry in enumerate(playlist):
+        if not isinstance(entry, dict):
+            entry = dict(zip(ENTRY_FIELDS, entry))
+        unknown = set(entry) - set(ENTRY_FIELDS)
+        if unknown:
+            raise TypeError(f"playlist entry {i}: unknown field(s): {', '.join(sorted(unknown))}")
+        entry = {"brand_text": brand_text, "tagline_text": tagline_text, "logo_path": logo_path,
+                 **{k: v for k, v in entry.items() if v is not None}}
+        if not entry["logo_path"]:
+            raise ValueError(f"playlist entry {i} has no logo")
+        entries.append(entry)
+    if not entries:
+        raise ValueError("playlist is empty")
+    return entries
+
+def _num(value):
+    return f"{round(value, 5):g}"
+
+def stretch_css(css, count):
+    """Stretch every animation in ``css`` to ``count`` cycles, moving only in the first.
+
+    Keyframe offsets are divided by ``count`` and the final frame is held to
+    100%, so easing and motion within the cycle are unchanged.
+    """
+    def keyframes(match):
+        frames = _FRAME_RE.findall(match.group(2))
+        body = _FRAME_RE.sub(lambda f: f"{f[1]}{_num(float(f[2]) / count)}% {f[3]}", match.group(2))
+        indent, _, last = frames[-1]
+        return f"{match.group(1)}{body}\n{indent}100% {last}{match.group(3)}"
+    css = _KEYFRAMES_RE.sub(keyframes, css)
+    return _DURATION_RE.sub(lambda m: f"{m[1]}{_num(float(m[2]) * count)}s", css)
+
+def _sprite(prefix, box, sheet, scale, shift_y):
+    # Background/mask size and position (in brand-size units) that show
+    # ``box`` of the atlas in an element whose height is 1 brand size.
+    x, y, w, h = box
+    unit = scale / h
+    size = f"calc(var(--brand-size) * {_num(sheet[0] * unit)}) calc(var(--brand-size) * {_num(sheet[1] * unit)})"
+    position = f"calc(var(--brand-size) * {_num(-x * unit)}) calc(var(--brand-size) * {_num(shift_y - y * unit)})"
+    return f"{prefix}-size: {size}; {prefix}-position: {position};"
+
+def playlist_css(count, total, boxes, sheet, stroke_scale, clip_stroke):
+    """Rules that give each entry its turn and its atlas cell."""
+    cycle = total * count
+    rules = [
+        f".slot {{ visibility: hidden; animation: slotTurn {_num(cycle)}s step-end infinite; }}",
+        f"@keyframes slotTurn {{ 0% {{ visibility: visible; }} {_num(100 / count)}% {{ visibility: hidden; }} "
+        f"100% {{ visibility: hidden; }} }}",
+        ".slot .logo { content: normal; max-width: none; background: var(--logo-img) no-repeat; }",
+    ]
+    # The clipped outline's box is the logo box grown by stroke_scale.
+    grow = max(1.0, stroke_scale) if clip_stroke else 1.0
+    stroke = ".strokeMask" if clip_stroke else ".logoStroke"
+    for k, box in enumerate(boxes):
+        # Like the <img>: 1 brand size tall, at most 6 wide, contained.
+        ratio = box[2] / box[3]
+        scale = min(1.0, 6 / ratio)
+        entry = f".entry{k}"
+        if k:
+            rules.append(f"{entry}, {entry} * {{ animation-delay: -{_num((count - k) * total)}s; }}")
+        rules.append(f"{entry} .logo {{ width: calc(var(--brand-size) * {_num(min(ratio, 6))}); "
+                     f"{_sprite('background', box, sheet, scale, (1 - scale) / 2)} }}")
+        masks = (_sprite(prefix, box, sheet, scale * grow, (1 - scale) / 2 * grow) for prefix in ("-webkit-mask", "mask"))
+        rules.append(f"{entry} {stroke} {{ {' '.join(masks)} }}")
+    return "\n    ".join(rules)
+
+def playlist_html(entries, boxes, sheet, logo_src, font_faces=None, **params):
+    """One page playing ``entries`` in turn, their logos drawn from the atlas at ``logo_src``.
+
+    ``boxes`` and ``sheet`` come from ``logo_images.atlas_layout``; ``params``
+    are the shared ``RENDER_PARAMS``.
+    """
+    page = overlay_html(logo_src=logo_src, inline_logo=True, font_faces=font_faces, **params)
+    head, _, rest = page.partition("<style>")
+    css, _, rest = rest.partition("</style>")
+    tail = rest.partition("<body>")[0]
+    css = stretch_css(css, len(entries)).rstrip(" ")
+    # Without a pre-rendered outline only the low-cost profile clips it.
+    clip_stroke = params["profile"] == "lowcost"
+    css += "    " + playlist_css(len(entries), Timeline.from_settings(params).total, boxes, sheet,
+                                 params["stroke_scale"], clip_stroke) + "\n  "
+    bodies = []
+    for k, entry in enumerate(entries):
+        # Only the markup is kept, so these renders can share the HTML cache.
+        html = overlay_html(**{**params, "brand_text": entry["brand_text"], "tagline_text": entry["tagline_text"]})
+        body = html.partition("<body>")[2].partition("</body>")[0].rstrip()
+        body = body.replace('<div class="stage">', f'<div class="stage slot entry{k}">', 1)
+        bodies.append(_LOGO_IMG_RE.sub('<div class="logo"></div>', body, count=1))
+    return f"{head}<style>{css}</style>{tail}<body>{''.join(bodies)}\n</body>\n</html>\n"
@@ -0,0 +1,156 @@
+"""Live preview: serve the overlay from memory and push setting changes over SSE.
+
+The page is rendered with ``overlay_html`` (nothing is written to disk) and
+gets a small script that listens on ``/events``. Each ``update()`` re-renders
+the HTML and pushes the new ``<style>`` block, and the body when the markup
+changed, so custom properties and keyframes change in place without a
+reload. Clients that fall behind only ever get the newest state.
+"""
+import json
+import mimetypes
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from local_server import LOOPBACK_HOSTS, LocalHandler
+from overlay_core import DEFAULTS, RENDER_PARAMS, between, overlay_html
+
+KEEPALIVE_SECONDS = 15
+
+CLIENT_SCRIPT = """<script>
+    // Live preview: apply new styles/markup pushed by the app.
+    (function () {
+      var version = %d, body = null;
+      new EventSource("/events").onmessage = function (e) {
+        var m = JSON.parse(e.data);
+        if (m.version === version) { body = m.body; return; }
+        version = m.version;
+        document.querySelector("style").textContent = m.css;
+        if (m.body !== body) document.body.innerHTML = m.body;
+        body = m.body;
+      };
+    })();
+  </script>
+"""
+
+class PreviewServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self._cond = threading.Condition()
+        self._version = 0
+        self._html = "<!DOCTYPE html><html><head><style></style></head><body></body></html>"
+        self._message = None
+        self._logo = None
+        self._logo_cache = (None, None, None)
+        self._closed = False
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.preview = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="overlay-preview", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def update(self, settings):
+        """Re-render from ``settings`` (as for ``render_overlay``) and notify open pages."""
+        logo = settings.get("logo_path") or None
+        stamp = 0
+        if logo and Path(logo).is_file():
+            stamp = Path(logo).stat().st_mtime_ns
+        params = {name: settings.get(name, DEFAULTS[name]) for name in RENDER_PARAMS}
+        # The stamp makes the page refetch the logo when the file changes.
+        html = overlay_html(logo_src=f"/logo?{stamp}", **params)
+        with self._cond:
+            self._version += 1
+            self._html = html
+            self._logo = logo
+            self._message = json.dumps({"version": self._version, "css": between(html, "<style>", "</style>"),
+                                        "body": between(html, "<body>", "</body>")})
+            self._cond.notify_all()
+
+    def page(self):
+        with self._cond:
+            html, version = self._html, self._version
+        return html.replace("</head>", CLIENT_SCRIPT % version + "</head>", 1)
+
+    def logo(self):
+        """``(bytes, content type)`` of the current logo, or None."""
+        with self._cond:
+            path = self._logo
+        if not path:
+            return None
+        try:
+            mtime = Path(path).stat().st_mtime_ns
+        except OSError:
+            return None
+        cached_path, cached_mtime, data = self._logo_cache
+        if (cached_path, cached_mtime) != (path, mtime):
+            data = Path(path).read_bytes()
+            self._logo_cache = (path, mtime, data)
+        return data, mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    def wait(self, seen, timeout=KEEPALIVE_SECONDS):
+        """Block until there is a version newer than ``seen``; returns ``(version, message)``.
+
+        Returns ``(None, None)`` once the server is stopping.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or (self._message and self._version != seen), timeout)
+            if self._closed:
+                return None, None
+            return self._version, self._message
+
+class _Handler(LocalHandler):
+    def do_GET(self):
+        if not self.host_allowed(LOOPBACK_HOSTS):
+            self.send_error(403)
+            return
+        preview = self.server.preview
+        path = urlsplit(self.path).path
+        if path == "/":
+            self.send_body(preview.page().encode("utf-8"), "text/html; charset=utf-8")
+        elif path == "/logo":
+            logo = preview.logo()
+            if logo is None:
+                self.send_error(404)
+            else:
+                self.send_body(*logo)
+        elif path == "/events":
+            self._events(preview)
+        else:
+            self.send_error(404)
+
+    def _events(self, preview):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        seen = None
+        try:
+            while True:
+                version, message = preview.wait(seen)
+                if version is None:
+                    return
+                if version == seen:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self.wfile.write(f"data: {message}\n\n".encode("utf-8"))
+                    seen = version
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        finally:
+            self.close_connection = True
@@ -0,0 +1,302 @@
+"""Project files: many named overlay presets sharing logos and fonts.
+
+A project is a ``.json`` or ``.toml`` file::
+
+    output_dir = "overlays"              # relative to the project file
+
+    [logos]
+    main = "logos/main.png"
+
+    [fonts]
+    brand = "Inter"
+
+    [defaults]                           # applied to every preset
+    accent_color = "#00C2FF"
+
+    [presets.starting-soon]
+    logo = "main"                        # a [logos] key, or a path
+    font = "brand"                       # a [fonts] key, or a family name
+    brand_text = "Starting soon"
+
+    [[presets.sponsors.playlist]]        # rotate entries (see playlist.py)
+    brand_text = "Acme"
+    logo = "logos/acme.png"
+
+Presets take any of ``render_overlay``'s settings. ``rebuild`` records what
+each overlay was built from (its settings, the logo's content hash, the
+embedded font files and the renderer version) in ``.overlay-build.json``
+under the output folder and only renders presets whose inputs changed.
+
+    python project.py rebuild show.toml
+    python project.py watch show.toml
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from asset_store import atomic_write
+from overlay_core import DEFAULTS, RENDER_OPTIONS, RENDER_PARAMS, default_asset_store, resolve_settings
+
+STATE_NAME = ".overlay-build.json"
+# Bump when the state layout changes; an unknown state rebuilds everything.
+STATE_VERSION = 1
+# Modules whose code shapes the output; editing any of them rebuilds all presets.
+RENDERER_MODULES = ("overlay_core", "timeline", "logo_images", "fonts", "playlist")
+
+Project = namedtuple("Project", "path output_dir presets")
+RebuildResult = namedtuple("RebuildResult", "name status reason error")
+
+def _read(path):
+    path = Path(path)
+    if path.suffix.lower() == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_project(path):
+    """Read a project file into a ``Project``.
+
+    ``presets`` maps each name to its settings (defaults applied, ``logo`` and
+    ``font`` references resolved, logo paths made absolute), ready for
+    ``resolve_settings``.
+    """
+    path = Path(path).resolve()
+    data = _read(path)
+    base = path.parent
+    logos = data.get("logos", {})
+    fonts = data.get("fonts", {})
+    defaults = data.get("defaults", {})
+    presets = {}
+    for name, preset in data.get("presets", {}).items():
+        settings = {**defaults, **preset}
+        logo = settings.pop("logo", None)
+        if logo is not None:
+            settings["logo_path"] = logos.get(logo, logo)
+        if settings.get("logo_path"):
+            settings["logo_path"] = str(base / settings["logo_path"])
+        if settings.get("playlist"):
+            settings["playlist"] = [_playlist_entry(entry, base, logos) for entry in settings["playlist"]]
+        if settings.get("font") is not None:
+            settings["font"] = fonts.get(settings["font"], settings["font"])
+        presets[str(name)] = settings
+    return Project(path, base / data.get("output_dir", "overlays"), presets)
+
+def _playlist_entry(entry, base, logos):
+    entry = dict(entry) if isinstance(entry, dict) else dict(zip(("brand_text", "tagline_text", "logo_path"), entry))
+    logo = entry.pop("logo", None)
+    if logo is not None:
+        entry["logo_path"] = logos.get(logo, logo)
+    if entry.get("logo_path"):
+        entry["logo_path"] = str(base / entry["logo_path"])
+    return entry
+
+@lru_cache(maxsize=None)
+def renderer_version():
+    """Digest of the renderer's source; changes whenever its output could."""
+    h = hashlib.sha256()
+    for module in RENDERER_MODULES:
+        h.update(Path(__import__(module).__file__).read_bytes())
+    return h.hexdigest()
+
+def preset_inputs(kwargs, store):
+    """What an overlay built from ``kwargs`` depends on, as ``{input: digest}``."""
+    settings = {k: v for k, v in kwargs.items() if k != "logo_path"}
+    inputs = {
+        "settings": hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest(),
+        "renderer": renderer_version(),
+    }
+    if kwargs["logo_path"]:
+        inputs["logo"] = store.digest(kwargs["logo_path"])
+    for i, entry in enumerate(kwargs.get("playlist") or ()):
+        if entry.get("logo_path"):
+            inputs[f"playlist logo {i}"] = store.digest(entry["logo_path"])
+    if kwargs.get("embed_font"):
+        from fonts import BRAND_WEIGHT, TAGLINE_WEIGHT, find_font_file, primary_family
+        family = primary_family(kwargs["font_family_css"])
+        for weight in (BRAND_WEIGHT, TAGLINE_WEIGHT):
+            found = find_font_file(family, weight)
+            inputs[f"font {weight}"] = store.digest(found[0]) if found else "missing"
+    return inputs
+
+def _load_state(path):
+    try:
+        state = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("presets", {})
+
+def _stale_reason(previous, inputs, output_dir):
+    if previous is None:
+        return "new"
+    changed = [name for name in inputs.keys() | previous["inputs"].keys()
+               if inputs.get(name) != previous["inputs"].get(name)]
+    if changed:
+        return ", ".join(sorted(changed)) + " changed"
+    if previous["output_dir"] != str(output_dir) or not (output_dir / "overlay.html").is_file():
+        return "output missing"
+    return None
+
+def rebuild(project_path, force=False, workers=None):
+    """Render the presets of ``project_path`` whose inputs changed since the last rebuild.
+
+    Returns one ``RebuildResult`` per preset, with ``status`` "built",
+    "unchanged" or "failed". A failing preset never stops the others and is
+    retried next time.
+    """
+    from batch import render_batch
+
+    project = load_project(project_path)
+    state_path = project.output_dir / STATE_NAME
+    state = _load_state(state_path)
+    store = default_asset_store()
+    results = {}
+    todo = []
+    for name, settings in project.presets.items():
+        try:
+            kwargs = resolve_settings(settings)
+            output_dir = project.output_dir / settings.get("output_dir", name)
+            kwargs["output_dir"] = str(output_dir)
+            inputs = preset_inputs(kwargs, store)
+        except Exception as e:
+            results[name] = RebuildResult(name, "failed", None, f"{type(e).__name__}: {e}")
+            continue
+        reason = "forced" if force else _stale_reason(state.get(name), inputs, output_dir)
+        if reason is None:
+            results[name] = RebuildResult(name, "unchanged", None, None)
+        else:
+            todo.append((name, settings, inputs, output_dir, reason))
+
+    rows = [{**settings, "name": name} for name, settings, *_ in todo]
+    built = render_batch(rows, project.output_dir, workers=workers)
+    new_state = {name: entry for name, entry in state.items() if name in project.presets}
+    for (name, settings, inputs, output_dir, reason), result in zip(todo, built):
+        if result.error:
+            new_state.pop(name, None)
+            results[name] = RebuildResult(name, "failed", reason, result.error)
+        else:
+            new_state[name] = {"inputs": inputs, "output_dir": str(output_dir)}
+            results[name] = RebuildResult(name, "built", reason, None)
+    if new_state != state:
+        project.output_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(state_path, json.dumps({"version": STATE_VERSION, "presets": new_state},
+                                            indent=1, sort_keys=True).encode("utf-8"))
+    return [results[name] for name in project.presets]
+
+def watched_paths(project_path):
+    """The project file and every logo its presets use."""
+    paths = {Path(project_path).resolve()}
+    try:
+        project = load_project(project_path)
+    except (OSError, ValueError, AttributeError):
+        return paths
+    paths.update(Path(s["logo_path"]) for s in project.presets.values() if s.get("logo_path"))
+    paths.update(Path(e["logo_path"]) for s in project.presets.values()
+                 for e in s.get("playlist") or () if e.get("logo_path"))
+    return paths
+
+def _snapshot(paths):
+    stamps = {}
+    for path in paths:
+        try:
+            st = path.stat()
+            stamps[path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+def watch(project_path, on_rebuild, interval=0.5, debounce=0.3, workers=None, stop=None):
+    """Rebuild now, then again whenever the project file or one of its logos changes.
+
+    Files are polled every ``interval`` seconds. A burst of changes (an
+    editor saving, a logo being exported) triggers a single rebuild once
+    nothing has changed for ``debounce`` seconds. ``on_rebuild`` gets each
+    ``rebuild`` result, or the exception when the project cannot be read.
+    Runs until ``stop`` (a ``threading.Event``) is set.
+    """
+    stop = stop or threading.Event()
+    snapshot = None
+    while not stop.is_set():
+        current = _snapshot(watched_paths(project_path))
+        if current != snapshot:
+            if snapshot is not None:
+                while not stop.wait(debounce):
+                    settled = _snapshot(watched_paths(project_path))
+                    if settled == current:
+                        break
+                    current = settled
+                if stop.is_set():
+                    return
+            snapshot = current
+            try:
+                on_rebuild(rebuild(project_path, workers=workers))
+            except (OSError, ValueError) as e:
+                on_rebuild(e)
+        stop.wait(interval)
+
+def save_preset(project_path, name, settings):
+    """Add or replace preset ``name`` in the JSON project at ``project_path``.
+
+    Only settings that differ from ``DEFAULTS`` are stored; the logo path is
+    kept relative to the project when it lives under it.
+    """
+    project_path = Path(project_path)
+    if project_path.suffix.lower() == ".toml":
+        raise ValueError("presets can only be saved to .json projects; edit .toml projects by hand")
+    data = _read(project_path) if project_path.exists() else {"output_dir": "overlays", "presets": {}}
+    preset = {k: v for k, v in settings.items()
+              if (k in RENDER_PARAMS or k in RENDER_OPTIONS or k == "font") and v != DEFAULTS.get(k, False)}
+    logo = settings.get("logo_path")
+    if logo:
+        logo = Path(logo).resolve()
+        base = project_path.resolve().parent
+        preset["logo_path"] = logo.relative_to(base).as_posix() if logo.is_relative_to(base) else str(logo)
+    data.setdefault("presets", {})[name] = preset
+    atomic_write(project_path, (json.dumps(data, indent=2) + "\n").encode("utf-8"))
+
+def _print_results(results):
+    if isinstance(results, Exception):
+        print(f"error: {type(results).__name__}: {results}", file=sys.stderr)
+        return
+    for r in results:
+        if r.status == "failed":
+            print(f"  {r.name}: failed: {r.error}", file=sys.stderr)
+        elif r.status == "built":
+            print(f"  {r.name}: built ({r.reason})")
+    built = sum(1 for r in results if r.status == "built")
+    failed = sum(1 for r in results if r.status == "failed")
+    print(f"{built} built, {len(results) - built - failed} unchanged, {failed} failed", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the overlay presets of a project file.")
+    parser.add_argument("command", choices=("rebuild", "watch"))
+    parser.add_argument("project", help=".json or .toml project file")
+    parser.add_argument("--force", action="store_true", help="rebuild every preset")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--debounce", type=float, default=0.3, help="seconds of quiet before a watch rebuild")
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        print(f"watching {args.project} and its logos (Ctrl+C to stop)")
+        try:
+            watch(args.project, _print_results, debounce=args.debounce, workers=args.workers)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    try:
+        results = rebuild(args.project, force=args.force, workers=args.workers)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {type(e).__name__}: {e}\n")
+    _print_results(results)
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
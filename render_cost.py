@@ -0,0 +1,340 @@
+"""Static render-cost analysis of an exported overlay.
+
+Reads ``overlay.html`` (from ``render_overlay`` or any similar file) and
+reports, per element and keyframe, which properties animate and what each
+costs in a Chromium-based browser source: ``compositor`` (transform and
+opacity, no repaint), ``paint`` (repainted every frame) or ``layout``
+(relayout, then repaint). It also counts ``will-change`` layers, flags
+``backdrop-filter`` and full-viewport layers, and estimates the texture
+memory the logo and outline need.
+
+    python render_cost.py overlay_project/overlay.html
+    python render_cost.py overlays/ --max-layers 8 --max-texture-mb 16 --no-paint
+
+The report is JSON. The exit status is 1 when any overlay is over budget,
+so batch builds can gate on it.
+"""
+import base64
+import io
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+
+from overlay_core import CANVAS, css_length_px
+
+COMPOSITOR = "compositor"
+PAINT = "paint"
+LAYOUT = "layout"
+
+# transform-origin and visibility are discrete: they switch at a keyframe and
+# cost nothing in between, so they count with the compositor properties.
+_COMPOSITOR_PROPS = {"transform", "transform-origin", "opacity", "translate", "rotate", "scale", "visibility"}
+_LAYOUT_PROPS = {
+    "width", "height", "min-width", "min-height", "max-width", "max-height", "top", "right", "bottom", "left",
+    "inset", "margin", "padding", "font-size", "font-weight", "font-family", "line-height", "letter-spacing",
+    "word-spacing", "border-width", "display", "position", "flex", "flex-basis", "gap", "row-gap", "column-gap",
+}
+_LAYOUT_PREFIXES = ("margin-", "padding-", "grid", "border-", "inset-")
+
+def property_cost(prop):
+    """``compositor``, ``paint`` or ``layout`` for animating CSS property ``prop``."""
+    prop = prop.strip().lower()
+    if prop.startswith("--"):
+        return PAINT
+    if prop in _COMPOSITOR_PROPS:
+        return COMPOSITOR
+    if prop in _LAYOUT_PROPS or (prop.startswith(_LAYOUT_PREFIXES) and not prop.endswith("color")
+                                 and not prop.endswith("radius")):
+        return LAYOUT
+    # filter, backdrop-filter, clip-path, masks, colors, shadows, ...
+    return PAINT
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+
+def _split_top(text, sep):
+    # Split on ``sep`` outside parentheses and quotes (data: URIs hold ';').
+    parts, depth, quote, start = [], 0, None, 0
+    for i, c in enumerate(text):
+        if quote:
+            quote = None if c == quote else quote
+        elif c in "'\"":
+            quote = c
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+def _blocks(css):
+    """``(prelude, body)`` for each top-level ``prelude { body }`` in ``css``."""
+    i, n = 0, len(css)
+    while i < n:
+        open_at = css.find("{", i)
+        if open_at < 0:
+            return
+        depth, quote, j = 0, None, open_at
+        while j < n:
+            c = css[j]
+            if quote:
+                quote = None if c == quote else quote
+            elif c in "'\"":
+                quote = c
+            elif c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+            j += 1
+        yield css[i:open_at].strip(), css[open_at + 1:j]
+        i = j + 1
+
+def declarations(body):
+    decls = {}
+    for part in _split_top(body, ";"):
+        name, sep, value = part.partition(":")
+        if sep and name.strip():
+            decls[name.strip().lower()] = value.strip()
+    return decls
+
+def parse_css(css):
+    """``(rules, keyframes)``: ``[(selector, decls)]`` and ``{name: [(offsets, decls)]}``.
+
+    ``@media`` blocks are flattened in; ``@font-face`` and other at-rules are skipped.
+    """
+    rules, keyframes = [], {}
+    for prelude, body in _blocks(_COMMENT_RE.sub("", css)):
+        if prelude.startswith("@keyframes") or prelude.startswith("@-webkit-keyframes"):
+            name = prelude.split(None, 1)[1].strip()
+            keyframes[name] = [(prelude_kf, declarations(body_kf)) for prelude_kf, body_kf in _blocks(body)]
+        elif prelude.startswith(("@media", "@supports")):
+            inner_rules, inner_keyframes = parse_css(body)
+            rules.extend(inner_rules)
+            keyframes.update(inner_keyframes)
+        elif not prelude.startswith("@"):
+            rules.append((prelude, declarations(body)))
+    return rules, keyframes
+
+class _Markup(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.classes = {}
+        self.tags = {}
+        self.styles = []
+        self.images = {}
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        self.tags[tag] = self.tags.get(tag, 0) + 1
+        for cls in (attrs.get("class") or "").split():
+            self.classes[cls] = self.classes.get(cls, 0) + 1
+            if tag == "img" and attrs.get("src"):
+                self.images[cls] = attrs["src"]
+        self._in_style = tag == "style"
+
+    def handle_endtag(self, tag):
+        self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.styles.append(data)
+
+def _element_count(selector, markup):
+    # Count simple selectors (.class, tag, :root); anything fancier counts once.
+    counts = []
+    for sel in (s.strip() for s in selector.split(",")):
+        last = sel.split()[-1] if sel else sel
+        if re.fullmatch(r"\.[\w-]+", last):
+            counts.append(markup.classes.get(last[1:], 0))
+        elif re.fullmatch(r"[a-z]+", last):
+            counts.append(markup.tags.get(last, 0))
+        else:
+            counts.append(1)
+    return sum(counts)
+
+def _animation_names(decls, keyframes):
+    names = []
+    for key in ("animation", "animation-name"):
+        for part in _split_top(decls.get(key, ""), ","):
+            names.extend(token for token in part.split() if token in keyframes)
+    return names
+
+def _is_full_viewport(decls):
+    if decls.get("position") == "fixed" and decls.get("inset", "").split() in (["0"], ["0", "0", "0", "0"]):
+        return True
+    # Percentages are relative to the parent, so only viewport units count.
+    return decls.get("width") == "100vw" and decls.get("height") == "100vh"
+
+def _image_size(src, base):
+    # (width, height) of an <img>/url() source: a data: URI or a path next to the HTML.
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        if src.startswith("data:"):
+            data = base64.b64decode(src.partition(",")[2])
+            with Image.open(io.BytesIO(data)) as img:
+                return img.size
+        with Image.open(base / src.split("?")[0]) as img:
+            return img.size
+    except (OSError, ValueError):
+        return None
+
+def _url(value):
+    m = re.search(r"url\(\s*['\"]?(.*?)['\"]?\s*\)", value or "", re.S)
+    return m.group(1) if m else None
+
+def analyze_html(html, base=".", viewport=CANVAS, device_scale=1.0):
+    """Cost report (a JSON-ready dict) for overlay ``html``; ``base`` resolves relative image paths."""
+    base = Path(base)
+    markup = _Markup()
+    markup.feed(html)
+    rules, keyframes = parse_css("\n".join(markup.styles))
+    by_selector = {}
+    for selector, decls in rules:
+        by_selector.setdefault(selector, {}).update(decls)
+
+    elements, layers = [], 0
+    summary = {COMPOSITOR: 0, PAINT: 0, LAYOUT: 0}
+    flags = []
+    if not rules:
+        flags.append("no static CSS found; a runtime overlay builds its styles at load time")
+    for selector, decls in by_selector.items():
+        count = _element_count(selector, markup)
+        if count == 0:
+            continue
+        animations = []
+        for name in _animation_names(decls, keyframes):
+            frames = []
+            props = {}
+            for offsets, frame in keyframes[name]:
+                costs = {prop: property_cost(prop) for prop in frame}
+                props.update(costs)
+                frames.append({"offset": offsets, "properties": costs})
+            for cost in props.values():
+                summary[cost] += count
+            animations.append({"name": name, "properties": props, "keyframes": frames})
+        will_change = [p.strip() for p in decls.get("will-change", "").split(",") if p.strip() and p.strip() != "auto"]
+        entry = {"selector": selector, "elements": count, "animations": animations}
+        if will_change:
+            entry["will_change"] = will_change
+            layers += count
+        if "backdrop-filter" in decls or "-webkit-backdrop-filter" in decls:
+            entry["backdrop_filter"] = decls.get("backdrop-filter") or decls["-webkit-backdrop-filter"]
+            flags.append(f"{selector}: backdrop-filter re-samples and blurs everything behind it every frame")
+        if _is_full_viewport(decls) and (will_change or animations or "background" in decls):
+            entry["full_viewport"] = True
+            flags.append(f"{selector}: full-viewport layer ({viewport[0]}x{viewport[1]})")
+        if animations or will_change or "backdrop_filter" in entry or "full_viewport" in entry:
+            elements.append(entry)
+    for entry in elements:
+        for anim in entry["animations"]:
+            for prop, cost in anim["properties"].items():
+                if cost != COMPOSITOR:
+                    flags.append(f"{entry['selector']}: animates {prop} ({cost} every frame)")
+
+    return {
+        "elements": elements,
+        "layers": layers,
+        "animated_properties": summary,
+        "flags": flags,
+        "texture": _texture_estimate(by_selector, markup, base, viewport, device_scale),
+    }
+
+def _texture_estimate(by_selector, markup, base, viewport, device_scale):
+    # Decoded logo bitmaps plus the logo and outline layers at display size.
+    banner = next((d for s, d in by_selector.items() if "--brand-size" in d), {})
+    try:
+        brand_px = css_length_px(banner.get("--brand-size", ""), viewport)
+    except ValueError:
+        brand_px = None
+    root = by_selector.get(":root", {})
+    logo_src = markup.images.get("logo") or _url(root.get("--logo-img"))
+    natural = _image_size(logo_src, base) if logo_src else None
+    result = {"logo_natural": natural, "brand_px": brand_px, "bytes": None, "parts": {}}
+    if not natural or not brand_px:
+        return result
+    mask_users = sum(1 for d in by_selector.values()
+                     if "var(--logo-img)" in d.get("mask-image", "") or (logo_src and logo_src in d.get("mask-image", "")))
+    decodes = 1 + (1 if mask_users else 0)
+    h = brand_px * device_scale
+    w = min(h * natural[0] / natural[1], brand_px * 6 * device_scale)
+    stroke_scale = 1.0
+    stroke = by_selector.get(".logoStroke") or {}
+    m = re.search(r"scale\(([\d.]+)\)", stroke.get("transform", ""))
+    if m:
+        stroke_scale = float(m.group(1))
+    clip = by_selector.get(".strokeClip") or {}
+    insets = re.findall(r"-([\d.]+)%", clip.get("inset", ""))
+    if insets:
+        stroke_scale = 1 + 2 * float(insets[0]) / 100
+    parts = {
+        "logo_decoded": natural[0] * natural[1] * 4 * decodes,
+        "logo_layer": round(w * h * 4),
+        "stroke_layer": round(w * h * stroke_scale * stroke_scale * 4),
+    }
+    result.update(stroke_scale=round(stroke_scale, 4), decodes=decodes, parts=parts, bytes=sum(parts.values()))
+    return result
+
+def analyze(path, viewport=CANVAS, device_scale=1.0):
+    path = Path(path)
+    report = analyze_html(path.read_text(encoding="utf-8"), path.parent, viewport, device_scale)
+    report["file"] = str(path)
+    return report
+
+def over_budget(report, max_layers=None, max_texture_mb=None, allow_paint=True, allow_layout=False,
+                allow_backdrop=True):
+    """Reasons ``report`` breaks the budget (empty when it fits)."""
+    problems = []
+    if max_layers is not None and report["layers"] > max_layers:
+        problems.append(f"{report['layers']} will-change layers > {max_layers}")
+    texture = report["texture"]["bytes"]
+    if max_texture_mb is not None and texture is not None and texture > max_texture_mb * 2**20:
+        problems.append(f"{texture / 2**20:.1f} MB texture > {max_texture_mb} MB")
+    if not allow_paint and report["animated_properties"][PAINT]:
+        problems.append(f"{report['animated_properties'][PAINT]} paint-triggering animated properties")
+    if not allow_layout and report["animated_properties"][LAYOUT]:
+        problems.append(f"{report['animated_properties'][LAYOUT]} layout-triggering animated properties")
+    if not allow_backdrop and any("backdrop_filter" in e for e in report["elements"]):
+        problems.append("uses backdrop-filter")
+    return problems
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Estimate the render cost of exported overlays.")
+    parser.add_argument("paths", nargs="+", help="overlay.html files or folders to search for them")
+    parser.add_argument("--size", default="%dx%d" % CANVAS, help="canvas size, e.g. 1920x1080")
+    parser.add_argument("--device-scale", type=float, default=1.0)
+    parser.add_argument("--max-layers", type=int)
+    parser.add_argument("--max-texture-mb", type=float)
+    parser.add_argument("--no-paint", action="store_true", help="fail overlays that animate paint properties")
+    parser.add_argument("--allow-layout", action="store_true", help="do not fail layout-triggering animations")
+    parser.add_argument("--no-backdrop", action="store_true", help="fail overlays that use backdrop-filter")
+    args = parser.parse_args(argv)
+
+    viewport = tuple(int(v) for v in args.size.lower().split("x"))
+    files = []
+    for p in map(Path, args.paths):
+        files.extend(sorted(p.rglob("overlay.html")) if p.is_dir() else [p])
+    reports, failed = [], 0
+    for f in files:
+        report = analyze(f, viewport, args.device_scale)
+        report["over_budget"] = over_budget(report, args.max_layers, args.max_texture_mb, not args.no_paint,
+                                            args.allow_layout, not args.no_backdrop)
+        failed += bool(report["over_budget"])
+        reports.append(report)
+    json.dump(reports[0] if len(reports) == 1 else reports, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
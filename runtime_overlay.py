@@ -0,0 +1,288 @@
+"""Runtime-parameterized overlay: one HTML file for every variant.
+
+The page comes from the same Jinja template as ``render_overlay``, but every
+per-variant value (texts, colors, sizes, durations, slide distances, logo) is
+rendered as a placeholder. A small script fills them in at load time from the
+URL query and/or a sidecar, working out the keyframe offsets the same way
+``Timeline`` does, before anything is shown:
+
+    overlay.html?brand_text=cody%20raves&accent_color=%23ff0066&in_duration=3
+    overlay.html?config=cody        (loads cody.js, see ``variant_config``)
+
+Sidecars are JSON wrapped in one ``overlayConfig(...)`` call so they load from
+file:// in OBS, where fetch() is blocked. Query parameters override the
+sidecar, which overrides the defaults baked in at export.
+"""
+import json
+import re
+from pathlib import Path
+
+from asset_store import atomic_write, write_if_changed
+from overlay_core import (DEFAULTS, RENDER_PARAMS, between, check_profile, coerce_param, default_asset_store,
+                          overlay_template, resolve_settings)
+
+# The overlay's structure (profile, effects) is fixed at export; these are
+# the settings a variant can change.
+RUNTIME_PARAMS = tuple(name for name in RENDER_PARAMS if name != "profile")
+TEXT_PARAMS = ("brand_text", "tagline_text")
+
+# Names the page's ``?config=`` loader accepts, so every sidecar written
+# here can be loaded and stays inside the output folder.
+_CONFIG_NAME_RE = re.compile(r"^[\w.-]+$")
+
+class _Slot:
+    """Stand-in for a template value that is only known in the browser.
+
+    Supports what the template does with values: ``|round``, ``+``/``-`` a
+    number, ``'prefix' + value`` and indexing.
+    """
+
+    def __init__(self, registry, name, offset=0.0, rounded=False, prefix=""):
+        self._registry = registry
+        self._spec = {"n": name, "o": offset, "r": rounded, "p": prefix}
+
+    def _derive(self, **changes):
+        spec = dict(self._spec, **changes)
+        return _Slot(self._registry, spec["n"], spec["o"], spec["r"], spec["p"])
+
+    def __round__(self, ndigits=None):
+        return self._derive(r=True)
+
+    def __add__(self, other):
+        return self._derive(o=self._spec["o"] + other)
+
+    def __sub__(self, other):
+        return self._derive(o=self._spec["o"] - other)
+
+    def __radd__(self, other):
+        return self._derive(p=other + self._spec["p"])
+
+    def __getitem__(self, index):
+        return self._derive(n=f"{self._spec['n']}.{index}")
+
+    def __bool__(self):
+        return True
+
+    def __str__(self):
+        self._registry.append(self._spec)
+        return f"\0{len(self._registry) - 1}\0"
+
+def _split(text):
+    # "a\0 3\0b" -> ["a", 3, "b"]: literal strings and slot indexes.
+    parts = text.split("\0")
+    return [int(part) if i % 2 else part for i, part in enumerate(parts) if part or i % 2]
+
+RUNTIME_SCRIPT = r"""(function () {
+  var T = %s;
+  var TEXT = %s;
+  function num(v, d) { v = parseFloat(v); return isFinite(v) ? v : d; }
+  function flag(v) { return v === true || /^(1|true|yes|on)$/i.test(String(v)); }
+  function esc(s) { return String(s).replace(/[&<>"']/g, function (c) { return "&#" + c.charCodeAt(0) + ";"; }); }
+  function css(s) { return String(s).replace(/[;{}<>\\]/g, ""); }
+  function fontStack(name) {
+    var first = !name ? "ui-sans-serif" : (/ /.test(name) ? '"' + name + '"' : name);
+    return first + ', ui-sans-serif, system-ui, -apple-system, "Segoe UI", Roboto, Inter, Arial, "Noto Sans", "Helvetica Neue", sans-serif';
+  }
+  function rgb(hex) {
+    var h = String(hex).trim().replace(/^#/, "");
+    if (h.length === 3) h = h.replace(/./g, "$&$&");
+    if (!/^[0-9a-f]{6}$/i.test(h)) return [0, 0, 0];
+    return [0, 2, 4].map(function (i) { return parseInt(h.substr(i, 2), 16); });
+  }
+  // Same phase boundaries as timeline.Timeline.
+  function timeline(s, v) {
+    var inD = s.in_duration, hold = inD + s.sustain_duration, total = hold + s.out_duration;
+    if (!(total > 0)) throw new Error("fade in + hold + fade out must be longer than 0s");
+    var logoInEnd = Math.min(inD, s.text_in_anim + s.logo_in_anim);
+    var strokeHide = Math.max(0, hold - s.stroke_hide_seconds);
+    var ulineStart = Math.min(s.text_in_anim + Math.max(0, s.underline_delay_seconds), total);
+    var ulineEnd = Math.min(s.text_in_anim + Math.max(0, s.underline_delay_seconds) + Math.max(0, s.underline_duration_seconds), total);
+    function p(t) { return t / total * 100; }
+    v.total_duration = total;
+    v.p_in_end = p(inD); v.p_hold_end = p(hold); v.p_text_in_end = p(s.text_in_anim);
+    v.p_logo_in_start = p(s.text_in_anim); v.p_logo_in_end = p(logoInEnd);
+    v.p_stroke_reveal_start = p(logoInEnd); v.p_stroke_reveal_end = p(Math.min(total, logoInEnd + s.stroke_reveal_seconds));
+    v.p_stroke_hide_start = p(strokeHide); v.p_stroke_hide_end = p(hold);
+    v.p_uline_start = p(ulineStart); v.p_uline_end = p(ulineEnd);
+    v.p_tag_reveal_start = p(ulineStart); v.p_tag_reveal_end = p(Math.min(total, ulineStart + Math.max(0, s.tagline_reveal_seconds)));
+    v.p_tag_hide_start = p(strokeHide); v.p_tag_hide_end = p(Math.min(total, strokeHide + Math.max(0, s.tagline_hide_seconds)));
+    v.hover_start_p = p(s.text_in_anim); v.hover_end_p = p(hold);
+    [1, 2, 3].forEach(function (q) { v["p_hover_q" + q] = v.hover_start_p + (v.hover_end_p - v.hover_start_p) * q / 4; });
+  }
+  function values(o) {
+    var s = {}, v = {};
+    Object.keys(T.defaults).forEach(function (k) {
+      var d = T.defaults[k], x = k in o ? o[k] : d;
+      s[k] = typeof d === "number" ? num(x, d) : typeof d === "boolean" ? flag(x) : String(x);
+    });
+    if (o.font && !("font_family_css" in o)) s.font_family_css = fontStack(String(o.font));
+    Object.keys(s).forEach(function (k) { v[k] = TEXT.indexOf(k) >= 0 ? esc(s[k]) : typeof s[k] === "string" ? css(s[k]) : s[k]; });
+    timeline(s, v);
+    var c = rgb(s.banner_bg_hex);
+    v.banner_r = c[0]; v.banner_g = c[1]; v.banner_b = c[2];
+    v.banner_opacity = Math.max(0, Math.min(s.banner_bg_opacity, 1));
+    v.hx = s.enable_hover ? Math.trunc(s.hover_x_px) : 0;
+    v.hy = s.enable_hover ? Math.trunc(s.hover_y_px) : 0;
+    ["text_in_px", "logo_in_px", "text_out_px", "logo_out_px"].forEach(function (k) { v[k] = Math.trunc(s[k]); });
+    v["stroke_inset.0"] = v["stroke_inset.1"] = Math.max(0, (s.stroke_scale - 1) / 2 * 100);
+    var logo = encodeURI(String(o.logo || T.logo)).replace(/['()]/g, escape);
+    v.logo_src = esc(logo); v.logo_url = "url('" + logo + "')";
+    v.show = s.show_tagline && s.tagline_text !== "";
+    if (!v.show) v.tagline_text = "";
+    return v;
+  }
+  function fill(parts, v) {
+    return parts.map(function (part) {
+      if (typeof part === "string") return part;
+      var slot = T.slots[part], x = v[slot.n];
+      if (typeof x === "number") return String(+((slot.r ? Math.round(x * 1e4) / 1e4 : x) + slot.o).toFixed(4));
+      return slot.p ? (x ? slot.p + x : "") : String(x);
+    }).join("");
+  }
+  function build(o) {
+    var v = values(o);
+    document.getElementById("overlay-style").textContent = fill(T.css, v);
+    document.body.innerHTML = fill(T.body, v);
+    if (!v.show) document.querySelectorAll(".tagline").forEach(function (el) { el.remove(); });
+  }
+  var query = {};
+  new URLSearchParams(location.search).forEach(function (value, key) { query[key] = value; });
+  var config = query.config;
+  if (config && /^[\w.-]+$/.test(config)) {
+    window.overlayConfig = function (o) { build(Object.assign({}, o, query)); };
+    var script = document.createElement("script");
+    script.src = config.replace(/\.js$/, "") + ".js";
+    script.onerror = function () { build(query); };
+    document.head.appendChild(script);
+  } else {
+    build(query);
+  }
+})();"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8" />
+  <title>Overlay</title>
+  <style id="overlay-style"></style>
+</head>
+<body>
+<script>
+%s
+</script>
+</body>
+</html>
+"""
+
+def runtime_defaults(settings=None):
+    """The JSON-ready defaults baked into a runtime overlay."""
+    merged = dict(DEFAULTS, **(settings or {}))
+    return {name: coerce_param(name, merged[name]) for name in RUNTIME_PARAMS}
+
+def runtime_html(profile="full", logo_src="assets/logo.png", defaults=None):
+    """The runtime-parameterized overlay page as a string."""
+    check_profile(profile)
+    slots = []
+    def slot(name):
+        return _Slot(slots, name)
+    names = ["total_duration", "p_in_end", "p_hold_end", "p_text_in_end", "p_logo_in_start", "p_logo_in_end",
+             "p_stroke_reveal_start", "p_stroke_reveal_end", "p_stroke_hide_start", "p_stroke_hide_end",
+             "p_uline_start", "p_uline_end", "p_tag_reveal_start", "p_tag_reveal_end", "p_tag_hide_start",
+             "p_tag_hide_end", "hover_start_p", "hover_end_p", "p_hover_q1", "p_hover_q2", "p_hover_q3",
+             "brand_text", "tagline_text", "text_color", "muted_color", "accent_color", "container_max_w",
+             "brand_size_css", "stroke_scale", "stroke_reveal_seconds", "stroke_hide_seconds", "text_in_px",
+             "logo_in_px", "text_out_px", "logo_out_px", "font_family_css", "banner_r", "banner_g", "banner_b",
+             "banner_opacity", "hx", "hy", "logo_src", "logo_url", "stroke_inset"]
+    lowcost = profile == "lowcost"
+    html = overlay_template().render(
+        {name: slot(name) for name in names},
+        show_tagline=True,
+        lowcost=lowcost,
+        clip_stroke=lowcost,
+        blur=lambda amount: "" if lowcost else f" filter: blur({amount});",
+        wc_filter="" if lowcost else ", filter",
+        inline_logo=False,
+        stroke_src=None,
+        font_faces=None,
+    )
+    template = {
+        "css": _split(between(html, "<style>", "</style>")),
+        "body": _split(between(html, "<body>", "</body>")),
+        "slots": slots,
+        "defaults": runtime_defaults(defaults),
+        "logo": logo_src,
+    }
+    # "</" would end the <script> element early.
+    data = json.dumps(template, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    return PAGE % (RUNTIME_SCRIPT % (data, json.dumps(list(TEXT_PARAMS))))
+
+def variant_config(settings):
+    """Sidecar script text for one variant (``overlay.html?config=<name>``).
+
+    ``settings`` may hold any runtime setting, ``font`` and ``logo`` (a URL
+    relative to the overlay); unknown keys raise ``TypeError``.
+    """
+    settings = dict(settings)
+    config = {}
+    for key in ("font", "logo"):
+        if settings.get(key) is not None:
+            config[key] = str(settings.pop(key))
+    unknown = set(settings) - set(RUNTIME_PARAMS)
+    if unknown:
+        raise TypeError(f"unknown setting(s): {', '.join(sorted(unknown))}")
+    config.update({name: coerce_param(name, value) for name, value in settings.items()})
+    return "overlayConfig(%s);\n" % json.dumps(config, ensure_ascii=False, indent=1).replace("</", "<\\/")
+
+def render_runtime_overlay(output_dir, logo_path=None, profile="full", asset_store=None, incremental=False,
+                           report=None, **defaults):
+    """Write the runtime-parameterized ``overlay.html`` (and default logo) into ``output_dir``.
+
+    ``defaults`` are the settings used when neither the query nor a sidecar
+    sets them; they are ``DEFAULTS`` otherwise.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    changed = []
+    logo_src = "assets/logo.png"
+    if logo_path:
+        store = asset_store or default_asset_store()
+        logo_src = "assets/logo" + Path(logo_path).suffix.lower()
+        (output_dir / "assets").mkdir(exist_ok=True)
+        if store.place(logo_path, output_dir / logo_src):
+            changed.append(logo_src)
+    data = runtime_html(profile, logo_src, defaults).encode("utf-8")
+    if not incremental:
+        atomic_write(output_dir / "overlay.html", data)
+        changed.append("overlay.html")
+    elif write_if_changed(output_dir / "overlay.html", data):
+        changed.append("overlay.html")
+    if report is not None:
+        report["changed"] = changed
+    return str(output_dir.resolve())
+
+def export_variants(rows, output_dir, profile="full", asset_store=None):
+    """One runtime overlay plus a ``<name>.js`` sidecar per manifest row.
+
+    Each row's logo is stored once by content under ``assets/``. Returns
+    ``{name: error or None}``.
+    """
+    output_dir = Path(output_dir)
+    store = asset_store or default_asset_store()
+    render_runtime_overlay(output_dir, profile=profile, asset_store=store, incremental=True)
+    (output_dir / "assets").mkdir(exist_ok=True)
+    results = {}
+    for index, row in enumerate(rows):
+        row = dict(row)
+        name = str(row.pop("name", "") or f"{index:05d}")
+        try:
+            if not _CONFIG_NAME_RE.match(name) or name in (".", ".."):
+                raise ValueError("name may only hold letters, digits, '.', '-' and '_'")
+            settings = resolve_settings(row)
+            logo = store.add(settings["logo_path"])
+            store.link(logo, output_dir / "assets" / logo.name)
+            variant = {k: v for k, v in settings.items() if k in RUNTIME_PARAMS and v != DEFAULTS.get(k)}
+            write_if_changed(output_dir / f"{name}.js", variant_config(dict(variant, logo="assets/" + logo.name)).encode("utf-8"))
+            results[name] = None
+        except Exception as e:
+            results[name] = f"{type(e).__name__}: {e}"
+    return results
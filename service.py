@@ -0,0 +1,374 @@
+"""Local render service: ``render_overlay`` over HTTP/JSON for bots and schedulers.
+
+    python service.py --assets logos --port 8765 --workers 4 --out overlays
+
+``POST /render`` takes a JSON object (``Content-Type: application/json``) of
+settings (anything ``resolve_settings`` accepts) plus ``output``:
+
+- ``"html"`` (default): the overlay as one self-contained HTML page.
+- ``"path"``: written to ``<out>/<name>/`` on this machine; answers ``{"path": ...}``.
+- ``"archive"``: a zip of the overlay folder.
+
+Renders run in a pool of worker processes that are started, and have their
+template compiled, before the first request. Results are cached by what the
+overlay depends on (settings, logo and font contents, renderer version, see
+``project.preset_inputs``), and identical requests that arrive while one is
+rendering wait for that render instead of starting their own. At most
+``queue_size`` renders are pending; beyond that requests get ``503`` with a
+``Retry-After`` header. ``GET /metrics`` reports counters, latency
+percentiles and throughput; ``GET /health`` answers once the pool is warm.
+Logo paths are relative to the ``--assets`` folder and may not leave it, so
+a request cannot read other files. The service listens on localhost only by
+default, answers only requests whose ``Host`` is localhost or one given with
+``--allow-host`` (against DNS rebinding), and never touches the network
+otherwise.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from local_server import LOOPBACK_HOSTS, LocalHandler
+from overlay_core import default_asset_store, overlay_template, render_overlay, resolve_settings
+from playlist import ENTRY_FIELDS
+from project import preset_inputs
+from sinks import MemorySink
+
+OUTPUTS = ("html", "path", "archive")
+# Latencies kept for the percentiles, and the window throughput is measured over.
+LATENCY_SAMPLES = 2048
+THROUGHPUT_WINDOW = 60.0
+MAX_BODY = 1 << 20
+
+_NAME_RE = re.compile(r"^[\w.-]+$")
+
+class Busy(Exception):
+    """Raised when the render queue is full."""
+
+def _warm():
+    overlay_template()
+    default_asset_store()
+
+def _render(kwargs, output):
+    # Runs in a worker process; returns the response body.
+    if output == "path":
+        return render_overlay(**kwargs, incremental=True).encode("utf-8")
+    sink = MemorySink()
+    if output == "html":
+        render_overlay(**{**kwargs, "single_file": True, "output_dir": "overlay"}, sink=sink)
+        return sink.files["overlay/overlay.html"]
+    render_overlay(**{**kwargs, "output_dir": "overlay"}, sink=sink)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path, data in sorted(sink.files.items()):
+            zf.writestr(path.partition("/")[2], data)
+    return buf.getvalue()
+
+class ResultCache:
+    """LRU of response bodies, bounded by their total size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                self.size -= len(self._entries.popitem(last=False)[1])
+
+    def __len__(self):
+        return len(self._entries)
+
+class Metrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = dict.fromkeys(("requests", "renders", "cache_hits", "coalesced", "rejected",
+                                     "bad_requests", "errors"), 0)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._finished = deque()
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def observe(self, seconds):
+        now = time.monotonic()
+        with self._lock:
+            self._latencies.append(seconds)
+            self._finished.append(now)
+            while self._finished and self._finished[0] < now - THROUGHPUT_WINDOW:
+                self._finished.popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            while self._finished and self._finished[0] < now - THROUGHPUT_WINDOW:
+                self._finished.popleft()
+            finished = len(self._finished)
+            counts = dict(self.counts)
+        uptime = now - self.started
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2) if latencies else None
+        return {
+            **counts,
+            "uptime_s": round(uptime, 1),
+            "latency_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": pct(1.0)},
+            "throughput_rps": round(finished / min(uptime, THROUGHPUT_WINDOW), 2) if uptime else 0.0,
+        }
+
+class RenderService:
+    """The pool, cache and queue behind the HTTP server; usable on its own."""
+
+    def __init__(self, asset_root, workers=None, queue_size=64, cache_bytes=64 << 20, output_root="overlays",
+                 timeout=120.0):
+        self.asset_root = Path(asset_root).resolve()
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.output_root = Path(output_root).resolve()
+        self.cache = ResultCache(cache_bytes)
+        self.metrics = Metrics()
+        self.store = default_asset_store()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+        self._pool_lock = threading.Lock()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Start the workers (each compiles the template as it starts) and wait until they answer."""
+        for future in [self._pool.submit(_warm) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def _submit(self, *args):
+        with self._pool_lock:
+            try:
+                return self._pool.submit(_render, *args)
+            except BrokenProcessPool:
+                # A worker died (and failed the renders it had); start over with a fresh pool.
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+                return self._pool.submit(_render, *args)
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def _asset(self, path):
+        # Symlinks are resolved first, so a link cannot lead out of the root either.
+        resolved = (self.asset_root / path).resolve()
+        if not resolved.is_relative_to(self.asset_root):
+            raise ValueError(f"{path!r} is outside the asset folder")
+        return str(resolved)
+
+    def _job(self, payload):
+        payload = dict(payload)
+        output = payload.pop("output", "html")
+        if output not in OUTPUTS:
+            raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+        name = str(payload.pop("name", "overlay"))
+        if not _NAME_RE.match(name) or name in (".", ".."):
+            raise ValueError("name may only hold letters, digits, '.', '-' and '_'")
+        payload.pop("output_dir", None)
+        if payload.get("logo_path"):
+            payload["logo_path"] = self._asset(payload["logo_path"])
+        if payload.get("playlist"):
+            payload["playlist"] = [dict(e) if isinstance(e, dict) else dict(zip(ENTRY_FIELDS, e))
+                                   for e in payload["playlist"]]
+            for entry in payload["playlist"]:
+                if entry.get("logo_path"):
+                    entry["logo_path"] = self._asset(entry["logo_path"])
+        kwargs = resolve_settings(payload)
+        kwargs["output_dir"] = str(self.output_root / name) if output == "path" else "overlay"
+        inputs = preset_inputs(kwargs, self.store)
+        key = hashlib.sha256(json.dumps([output, inputs], sort_keys=True).encode()).hexdigest()
+        return key, kwargs, output
+
+    def render(self, payload):
+        """Render ``payload``; returns ``(output, body bytes)``.
+
+        Raises ``TypeError``/``ValueError``/``OSError`` for bad settings,
+        ``Busy`` when the queue is full and ``TimeoutError`` when the render
+        takes longer than ``timeout`` seconds.
+        """
+        key, kwargs, output = self._job(payload)
+        data = self.cache.get(key)
+        if data is not None and (output != "path" or Path(data.decode(), "overlay.html").is_file()):
+            self.metrics.count("cache_hits")
+            return output, data
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                if len(self._inflight) >= self.queue_size:
+                    self.metrics.count("rejected")
+                    raise Busy(f"{len(self._inflight)} renders pending")
+                future = self._inflight[key] = Future()
+        if not leader:
+            self.metrics.count("coalesced")
+            return output, future.result(self.timeout)
+        self.metrics.count("renders")
+        try:
+            submitted = self._submit(kwargs, output)
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+        else:
+            # Outside the lock: the callback may run right here if the render is already done.
+            submitted.add_done_callback(lambda done: self._finish(key, future, done))
+        return output, future.result(self.timeout)
+
+    def _finish(self, key, future, done):
+        with self._lock:
+            del self._inflight[key]
+        error = done.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            self.cache.put(key, done.result())
+            future.set_result(done.result())
+
+CONTENT_TYPES = {"html": "text/html; charset=utf-8", "path": "application/json", "archive": "application/zip"}
+
+class _Handler(LocalHandler):
+    def do_GET(self):
+        if not self.host_allowed(self.server.allowed_hosts):
+            self._json(403, {"error": "unexpected Host header"})
+            return
+        service = self.server.service
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            metrics = service.metrics.snapshot()
+            metrics.update(pending=service.pending, queue_size=service.queue_size, workers=service.workers,
+                           cache_entries=len(service.cache), cache_bytes=service.cache.size)
+            self._json(200, metrics)
+        elif path == "/health":
+            self._json(200, {"ok": True})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self.host_allowed(self.server.allowed_hosts):
+            self._json(403, {"error": "unexpected Host header"})
+            return
+        service = self.server.service
+        if urlsplit(self.path).path != "/render":
+            self._json(404, {"error": "not found"})
+            return
+        # Browsers only send JSON cross-origin after a CORS preflight, which this server never grants.
+        if self.headers.get_content_type() != "application/json":
+            self._json(415, {"error": "expected Content-Type: application/json"})
+            return
+        start = time.perf_counter()
+        service.metrics.count("requests")
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY:
+                raise ValueError("request body too large")
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object of settings")
+            output, data = service.render(payload)
+        except Busy as e:
+            self._json(503, {"error": f"busy: {e}"}, {"Retry-After": "1"})
+            return
+        except TimeoutError:
+            # Before OSError, which TimeoutError derives from.
+            service.metrics.count("errors")
+            self._json(504, {"error": f"render took longer than {service.timeout:g} s"})
+            return
+        except (OSError, TypeError, ValueError) as e:
+            service.metrics.count("bad_requests")
+            self._json(400, {"error": f"{type(e).__name__}: {e}"})
+            return
+        except Exception as e:
+            service.metrics.count("errors")
+            self._json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        service.metrics.observe(time.perf_counter() - start)
+        if output == "path":
+            data = json.dumps({"path": data.decode("utf-8")}).encode("utf-8")
+        self.send_body(data, CONTENT_TYPES[output])
+
+    def _json(self, status, obj, headers=None):
+        if status >= 400:
+            # The request body may not have been read; do not reuse the connection.
+            self.close_connection = True
+        self.send_body(json.dumps(obj).encode("utf-8"), "application/json", status, headers)
+
+def serve(service, host="127.0.0.1", port=8765, allowed_hosts=()):
+    """An HTTP server for ``service``; call ``serve_forever`` on it.
+
+    Requests must name localhost, ``host`` or one of ``allowed_hosts`` in
+    their ``Host`` header.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.allowed_hosts = LOOPBACK_HOSTS | {host.lower()} | {h.lower() for h in allowed_hosts}
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve overlay renders over HTTP/JSON.")
+    parser.add_argument("--assets", required=True, help="folder the requested logo paths are read from")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost only)")
+    parser.add_argument("--allow-host", action="append", default=[], metavar="NAME",
+                        help="extra Host header name to accept, e.g. this machine's name with --host 0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--queue-size", type=int, default=64, help="pending renders before answering 503")
+    parser.add_argument("--cache-mb", type=float, default=64, help="memory for cached results")
+    parser.add_argument("--out", default="overlays", help="root folder for output=path renders")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds a request waits for its render")
+    args = parser.parse_args(argv)
+
+    service = RenderService(args.assets, args.workers, args.queue_size, int(args.cache_mb * (1 << 20)), args.out,
+                            args.timeout)
+    server = serve(service, args.host, args.port, args.allow_host)
+    service.warm()
+    host, port = server.server_address[:2]
+    print(f"serving on http://{host}:{port}/ with {service.workers} warm workers (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
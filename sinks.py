@@ -0,0 +1,244 @@
+"""Where ``render_overlay`` puts its files: a folder, a zip or tar archive, or memory.
+
+Paths handed to a sink are ``/``-separated and relative to its root. Assets
+come from the ``AssetStore`` and are written by content, so a logo shared by
+many overlays is stored once: archives stream every file straight in (tar
+members become hard links to the first copy, zips keep one copy per content
+under the root ``assets/`` folder) and ``MemorySink`` shares one ``bytes``.
+Archive memory use does not grow with the number of overlays written, apart
+from the archive's own index.
+
+    with open_sink("overlays.zip") as sink:
+        render_overlay(**settings, output_dir="cody", sink=sink)
+"""
+import io
+import os
+import posixpath
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+from asset_store import atomic_write, write_if_changed
+
+class OutputSink:
+    # True: identical assets live once under the root ``assets/`` folder and
+    # overlays refer to them with a relative path instead of their own copy.
+    shared_assets = False
+
+    def asset_path(self, prefix, name, digest):
+        """Where the asset ``name`` of the overlay under ``prefix`` is written."""
+        if self.shared_assets:
+            return posixpath.join("assets", digest + posixpath.splitext(name)[1])
+        return posixpath.join(prefix, "assets", name)
+
+    def write(self, path, data, incremental=False):
+        """Write ``data`` to ``path``; returns False when nothing had to change."""
+        raise NotImplementedError
+
+    def write_asset(self, path, stored, digest):
+        """Write the stored asset file ``stored`` (content ``digest``) to ``path``."""
+        raise NotImplementedError
+
+    def prune(self, directory, keep, patterns):
+        """Delete files in ``directory`` matching ``patterns`` but not in ``keep``; returns their names."""
+        return []
+
+    def location(self, prefix):
+        """What to show the user for the overlay under ``prefix``."""
+        return prefix
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class DirectorySink(OutputSink):
+    """Files under ``root``, assets hard-linked from the store; what ``render_overlay`` uses by default."""
+
+    def __init__(self, root, store):
+        self.root = Path(root)
+        self.store = store
+
+    def _path(self, path):
+        dest = self.root / path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        return dest
+
+    def write(self, path, data, incremental=False):
+        dest = self._path(path)
+        if incremental:
+            return write_if_changed(dest, data)
+        atomic_write(dest, data)
+        return True
+
+    def write_asset(self, path, stored, digest):
+        return self.store.link(stored, self._path(path))
+
+    def prune(self, directory, keep, patterns):
+        folder = self.root / directory
+        if not folder.is_dir():
+            return []
+        removed = []
+        for pattern in patterns:
+            for stale in folder.glob(pattern):
+                if stale.name not in keep and stale.name not in removed:
+                    stale.unlink()
+                    removed.append(stale.name)
+        if not any(folder.iterdir()):
+            folder.rmdir()
+        return removed
+
+    def location(self, prefix):
+        return str((self.root / prefix).resolve())
+
+class MemorySink(OutputSink):
+    """``files`` maps each path to its bytes; identical assets share one object. Meant for tests."""
+
+    def __init__(self):
+        self.files = {}
+        self._blobs = {}
+
+    def write(self, path, data, incremental=False):
+        changed = self.files.get(path) != data
+        self.files[path] = bytes(data)
+        return changed
+
+    def write_asset(self, path, stored, digest):
+        blob = self._blobs.get(digest)
+        if blob is None:
+            blob = self._blobs[digest] = Path(stored).read_bytes()
+        changed = self.files.get(path) is not blob
+        self.files[path] = blob
+        return changed
+
+    def prune(self, directory, keep, patterns):
+        prefix = posixpath.join(directory, "")
+        removed = [path[len(prefix):] for path in self.files
+                   if path.startswith(prefix) and "/" not in path[len(prefix):]
+                   and path[len(prefix):] not in keep
+                   and any(Path(path).match(pattern) for pattern in patterns)]
+        for name in removed:
+            del self.files[prefix + name]
+        return removed
+
+class ZipSink(OutputSink):
+    """Stream into a new zip at ``path``. Zips cannot link entries, so assets are shared."""
+    shared_assets = True
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED)
+        self._written = set()
+
+    def _info(self, path):
+        info = zipfile.ZipInfo(path, time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        return info
+
+    def write(self, path, data, incremental=False):
+        self._zip.writestr(self._info(path), data, zipfile.ZIP_DEFLATED)
+        return True
+
+    def write_asset(self, path, stored, digest):
+        if path in self._written:
+            return False
+        self._written.add(path)
+        # Images are compressed already; deflating them again only costs time.
+        info = self._info(path)
+        info.compress_type = zipfile.ZIP_STORED
+        with open(stored, "rb") as src, self._zip.open(info, "w") as dst:
+            while chunk := src.read(1 << 20):
+                dst.write(chunk)
+        return True
+
+    def location(self, prefix):
+        return f"{self.path.resolve()}!/{prefix}"
+
+    def close(self):
+        self._zip.close()
+
+class TarSink(OutputSink):
+    """Stream into a new tar at ``path`` (``compression`` "", "gz", "bz2" or "xz").
+
+    Each overlay keeps its own ``assets/``; repeated content becomes a hard
+    link to the first copy, which ``tar`` and ``tarfile`` extract as files.
+    """
+
+    def __init__(self, path, compression="gz"):
+        self.path = Path(path)
+        self._tar = tarfile.open(str(self.path), f"w|{compression}")
+        self._first = {}
+
+    def _info(self, path, size):
+        info = tarfile.TarInfo(path)
+        info.size = size
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        return info
+
+    def write(self, path, data, incremental=False):
+        self._tar.addfile(self._info(path, len(data)), io.BytesIO(data))
+        return True
+
+    def write_asset(self, path, stored, digest):
+        first = self._first.get(digest)
+        if first is not None:
+            info = self._info(path, 0)
+            info.type = tarfile.LNKTYPE
+            info.linkname = first
+            self._tar.addfile(info)
+            return True
+        self._first[digest] = path
+        with open(stored, "rb") as src:
+            self._tar.addfile(self._info(path, os.fstat(src.fileno()).st_size), src)
+        return True
+
+    def location(self, prefix):
+        return f"{self.path.resolve()}!/{prefix}"
+
+    def close(self):
+        self._tar.close()
+
+class RecordingSink(OutputSink):
+    """Keeps the writes in ``ops`` so a worker process can hand them to the real sink (``replay``)."""
+
+    def __init__(self, shared_assets=False):
+        self.shared_assets = shared_assets
+        self.ops = []
+
+    def write(self, path, data, incremental=False):
+        self.ops.append(("write", path, bytes(data)))
+        return True
+
+    def write_asset(self, path, stored, digest):
+        self.ops.append(("asset", path, str(stored), digest))
+        return True
+
+def replay(ops, sink):
+    for op, path, *args in ops:
+        if op == "write":
+            sink.write(path, *args)
+        else:
+            sink.write_asset(path, *args)
+
+_TAR_SUFFIXES = {".tar": "", ".tgz": "gz", ".tar.gz": "gz", ".tar.bz2": "bz2", ".tar.xz": "xz"}
+ARCHIVE_SUFFIXES = (".zip", *_TAR_SUFFIXES)
+
+def open_sink(path, store=None):
+    """An archive sink picked by ``path``'s suffix (``.zip``, ``.tar``, ``.tar.gz``/``.tgz``,
+    ``.tar.bz2``, ``.tar.xz``), otherwise a ``DirectorySink`` rooted there."""
+    name = str(path).lower()
+    if name.endswith(".zip"):
+        return ZipSink(path)
+    for suffix, compression in _TAR_SUFFIXES.items():
+        if name.endswith(suffix):
+            return TarSink(path, compression)
+    if store is None:
+        from overlay_core import default_asset_store
+        store = default_asset_store()
+    return DirectorySink(path, store)
@@ -0,0 +1,249 @@
+"""Keyframe timing for one overlay loop.
+
+``Timeline`` turns the duration settings into every phase boundary the CSS
+uses, and can sample the animated state of each element per frame (with
+NumPy) using the same keyframes and easing the generated stylesheet has.
+"""
+import math
+
+# The timing function the banner, text, underline and logo animations use.
+EASE = (0.2, 0.7, 0.0, 1.0)
+
+DURATION_FIELDS = (
+    "in_duration", "sustain_duration", "out_duration", "text_in_anim", "logo_in_anim",
+    "stroke_reveal_seconds", "stroke_hide_seconds", "underline_delay_seconds",
+    "underline_duration_seconds", "tagline_reveal_seconds", "tagline_hide_seconds",
+)
+MOTION_FIELDS = ("text_in_px", "logo_in_px", "text_out_px", "logo_out_px", "hover_x_px", "hover_y_px")
+
+# Animated properties reported by Timeline.sample(). Translations are in px,
+# blur in px, clip insets as a 0-1 fraction of the element's box.
+PROPERTIES = ("translate_x", "translate_y", "scale", "scale_x", "opacity", "blur",
+              "clip_top", "clip_right", "clip_bottom", "clip_left")
+_RESTING = {"scale": 1.0, "scale_x": 1.0, "opacity": 1.0}
+
+class Timeline:
+    __slots__ = DURATION_FIELDS + MOTION_FIELDS + (
+        "total", "in_end", "hold_end", "text_in_end", "logo_in_start", "logo_in_end",
+        "stroke_reveal_start", "stroke_reveal_end", "stroke_hide_start", "stroke_hide_end",
+        "uline_start", "uline_end", "tag_reveal_start", "tag_reveal_end",
+        "tag_hide_start", "tag_hide_end", "hover_start", "hover_end",
+    )
+
+    def __init__(self, in_duration, sustain_duration, out_duration, text_in_anim, logo_in_anim,
+                 stroke_reveal_seconds, stroke_hide_seconds, underline_delay_seconds,
+                 underline_duration_seconds, tagline_reveal_seconds, tagline_hide_seconds,
+                 text_in_px=0, logo_in_px=0, text_out_px=0, logo_out_px=0, hover_x_px=0, hover_y_px=0):
+        values = locals()
+        for name in DURATION_FIELDS:
+            setattr(self, name, float(values[name]))
+        for name in MOTION_FIELDS:
+            setattr(self, name, int(values[name]))
+
+        # All boundaries are in seconds from the start of the loop.
+        total = self.total = in_duration + sustain_duration + out_duration
+        if total <= 0:
+            raise ValueError("fade in + hold + fade out must be longer than 0s")
+        self.in_end = in_duration
+        self.hold_end = in_duration + sustain_duration
+        self.text_in_end = text_in_anim
+
+        self.logo_in_start = text_in_anim
+        self.logo_in_end = min(in_duration, text_in_anim + logo_in_anim)
+
+        self.stroke_reveal_start = self.logo_in_end
+        self.stroke_reveal_end = min(total, self.logo_in_end + stroke_reveal_seconds)
+        self.stroke_hide_start = max(0.0, in_duration + sustain_duration - stroke_hide_seconds)
+        self.stroke_hide_end = self.hold_end
+
+        u_start = text_in_anim + max(0.0, underline_delay_seconds)
+        u_end = u_start + max(0.0, underline_duration_seconds)
+        self.uline_start = min(u_start, total)
+        self.uline_end = min(u_end, total)
+
+        # Tagline wipe: reveal after the underline starts; hide aligned with the stroke hide.
+        self.tag_reveal_start = self.uline_start
+        self.tag_reveal_end = min(total, self.tag_reveal_start + max(0.0, tagline_reveal_seconds))
+        self.tag_hide_start = self.stroke_hide_start
+        self.tag_hide_end = min(total, self.tag_hide_start + max(0.0, tagline_hide_seconds))
+
+        # Idle drift runs across the hold window.
+        self.hover_start = self.text_in_end
+        self.hover_end = self.hold_end
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build from a settings dict (e.g. ``render_overlay`` kwargs); other keys are ignored."""
+        kwargs = {name: settings[name] for name in DURATION_FIELDS}
+        kwargs.update({name: settings[name] for name in MOTION_FIELDS if name in settings})
+        if not settings.get("enable_hover", True):
+            kwargs["hover_x_px"] = kwargs["hover_y_px"] = 0
+        return cls(**kwargs)
+
+    def pct(self, seconds):
+        return (seconds / self.total) * 100.0
+
+    def css_percentages(self):
+        """Keyframe offsets (in %) under the names the overlay template uses."""
+        p = self.pct
+        hover_start_p, hover_end_p = p(self.hover_start), p(self.hover_end)
+        def lerp(t): return hover_start_p + (hover_end_p - hover_start_p) * t
+        return {
+            "total_duration": self.total,
+            "p_in_end": p(self.in_end),
+            "p_hold_end": p(self.hold_end),
+            "p_text_in_end": p(self.text_in_end),
+            "p_logo_in_start": p(self.logo_in_start),
+            "p_logo_in_end": p(self.logo_in_end),
+            "p_stroke_reveal_start": p(self.stroke_reveal_start),
+            "p_stroke_reveal_end": p(self.stroke_reveal_end),
+            "p_stroke_hide_start": p(self.stroke_hide_start),
+            "p_stroke_hide_end": p(self.stroke_hide_end),
+            "p_uline_start": p(self.uline_start),
+            "p_uline_end": p(self.uline_end),
+            "p_tag_reveal_start": p(self.tag_reveal_start),
+            "p_tag_reveal_end": p(self.tag_reveal_end),
+            "p_tag_hide_start": p(self.tag_hide_start),
+            "p_tag_hide_end": p(self.tag_hide_end),
+            "hover_start_p": hover_start_p,
+            "hover_end_p": hover_end_p,
+            "p_hover_q1": lerp(0.25),
+            "p_hover_q2": lerp(0.50),
+            "p_hover_q3": lerp(0.75),
+        }
+
+    def problems(self):
+        """Settings that render but probably do not look as intended."""
+        issues = []
+        if min(getattr(self, name) for name in DURATION_FIELDS) < 0:
+            issues.append("negative duration")
+        if self.text_in_anim > self.in_duration:
+            issues.append("text slide-in outlasts the fade-in")
+        if self.text_in_anim + self.logo_in_anim > self.in_duration:
+            issues.append("logo slide-in is cut short by the fade-in")
+        if self.stroke_hide_start < self.stroke_reveal_end:
+            issues.append("outline starts hiding before it is fully revealed")
+        if self.tag_hide_start < self.tag_reveal_end:
+            issues.append("tagline starts hiding before it is fully revealed")
+        if self.uline_end > self.hold_end:
+            issues.append("underline is still drawing when the fade-out starts")
+        return issues
+
+    def tracks(self, profile="full"):
+        """Keyframes per element as ``(easing, [(offset %, {property: value}), ...])``.
+
+        These mirror the @keyframes in the overlay template, including the
+        0.01% steps it places before sharp changes. Wipes are reported as clip
+        insets in both profiles, since the lowcost wrappers show the same band.
+        """
+        p = self.pct
+        blur = (lambda px: 0.0) if profile == "lowcost" else float
+        def just_before(seconds): return round(p(seconds), 4) - 0.01
+        hold = p(self.hold_end)
+        shown = {"translate_x": 0.0, "translate_y": 0.0, "scale": 1.0, "opacity": 1.0, "blur": 0.0}
+
+        banner_out = {"translate_y": -self.logo_out_px, "scale": 0.985, "opacity": 0.0, "blur": blur(8)}
+        text_in = {"translate_x": -self.text_in_px, "translate_y": 0.0, "opacity": 0.0, "blur": blur(10)}
+        text_shown = {"translate_x": 0.0, "translate_y": 0.0, "opacity": 1.0, "blur": 0.0}
+        text_out = {"translate_x": 0.0, "translate_y": -self.text_out_px, "opacity": 0.0, "blur": blur(8)}
+        logo_in = {"translate_x": self.logo_in_px, "translate_y": 0.0, "scale": 0.985, "opacity": 0.0, "blur": blur(10)}
+        logo_out = {"translate_x": 0.0, "translate_y": -self.logo_out_px, "scale": 0.985, "opacity": 0.0, "blur": blur(8)}
+        hx, hy = float(self.hover_x_px), float(self.hover_y_px)
+        def at(x=0.0, y=0.0): return {"translate_x": x, "translate_y": y}
+        def uline(sx, o): return {"scale_x": sx, "opacity": o}
+        def tag(o, right=0.0, left=0.0): return {"opacity": o, "clip_right": right, "clip_left": left}
+        def stroke(o, top): return {"opacity": o, "clip_top": top}
+
+        return {
+            "banner": (EASE, [(0.0, dict(banner_out, translate_x=0.0)), (p(self.text_in_end), shown),
+                              (hold, shown), (100.0, dict(banner_out, translate_x=0.0))]),
+            "text": (EASE, [(0.0, text_in), (p(self.text_in_end), text_shown), (hold, text_shown), (100.0, text_out)]),
+            "underline": (EASE, [(0.0, uline(0, 0)), (just_before(self.uline_start), uline(0, 0)),
+                                 (p(self.uline_start), uline(0, 1)), (p(self.uline_end), uline(1, 1)),
+                                 (hold, uline(1, 1)), (100.0, uline(0, 0))]),
+            "tagline": (None, [(0.0, tag(0, right=1)), (just_before(self.tag_reveal_start), tag(0, right=1)),
+                               (p(self.tag_reveal_start), tag(1, right=1)), (p(self.tag_reveal_end), tag(1)),
+                               (just_before(self.tag_hide_start), tag(1)), (p(self.tag_hide_start), tag(1)),
+                               (p(self.tag_hide_end), tag(1, left=1)), (100.0, tag(0, left=1))]),
+            "logo": (EASE, [(0.0, logo_in), (p(self.logo_in_start), logo_in), (p(self.logo_in_end), shown),
+                            (hold, shown), (100.0, logo_out)]),
+            "hover": (None, [(0.0, at()), (p(self.hover_start), at()),
+                             (p(self.hover_start) + (hold - p(self.hover_start)) * 0.25, at(x=hx)),
+                             (p(self.hover_start) + (hold - p(self.hover_start)) * 0.50, at(y=hy)),
+                             (p(self.hover_start) + (hold - p(self.hover_start)) * 0.75, at(x=-hx)),
+                             (hold, at(y=-hy)), (round(hold, 4) + 0.01, at()), (100.0, at())]),
+            "stroke": (None, [(0.0, stroke(0, 1)), (just_before(self.stroke_reveal_start), stroke(0, 1)),
+                              (p(self.stroke_reveal_start), stroke(1, 1)), (p(self.stroke_reveal_end), stroke(1, 0)),
+                              (just_before(self.stroke_hide_start), stroke(1, 0)), (p(self.stroke_hide_start), stroke(1, 0)),
+                              (p(self.stroke_hide_end), stroke(0, 1)), (100.0, stroke(0, 1))]),
+        }
+
+    def frame_count(self, fps):
+        return max(1, math.ceil(self.total * fps - 1e-9))
+
+    def sample(self, fps=60, profile="full", times=None):
+        """Animated state of every element at ``fps`` frames per second over one loop.
+
+        Returns ``(times, states)`` where ``states[element][property]`` is a
+        NumPy array with one value per frame (see ``PROPERTIES``).
+        """
+        import numpy as np
+        if times is None:
+            times = np.arange(self.frame_count(fps), dtype=np.float64) / fps
+        offsets = np.asarray(times, dtype=np.float64) / self.total * 100.0
+        states = {}
+        for element, (easing, frames) in self.tracks(profile).items():
+            states[element] = _sample_track(np, frames, easing, offsets)
+        return times, states
+
+def _sample_track(np, frames, easing, offsets):
+    # Like the browser: offsets outside 0-100% are dropped, keyframes are
+    # ordered by offset and the last one wins at a repeated offset.
+    frames = sorted(((off, values) for off, values in frames if 0.0 <= off <= 100.0), key=lambda f: f[0])
+    stops = np.array([off for off, _ in frames])
+    keep = np.append(stops[1:] != stops[:-1], True)
+    frames = [f for f, k in zip(frames, keep) if k]
+    stops = stops[keep]
+
+    idx = np.clip(np.searchsorted(stops, offsets, side="right") - 1, 0, len(stops) - 2)
+    span = stops[idx + 1] - stops[idx]
+    t = np.clip(np.divide(offsets - stops[idx], span, out=np.ones_like(offsets), where=span > 0), 0.0, 1.0)
+    if easing is not None:
+        t = cubic_bezier(np, t, *easing)
+
+    out = {}
+    names = {name for _, values in frames for name in values}
+    for name in PROPERTIES:
+        if name not in names:
+            out[name] = np.full(offsets.shape, _RESTING.get(name, 0.0))
+            continue
+        values = np.array([values.get(name, _RESTING.get(name, 0.0)) for _, values in frames], dtype=np.float64)
+        out[name] = values[idx] + (values[idx + 1] - values[idx]) * t
+    return out
+
+def cubic_bezier(np, x, x1, y1, x2, y2, iterations=24):
+    """CSS ``cubic-bezier(x1, y1, x2, y2)`` evaluated at progress ``x`` (array)."""
+    # Solve bx(s) = x by bisection (the curve is monotonic in x for CSS
+    # timing functions), then return by(s).
+    lo = np.zeros_like(x)
+    hi = np.ones_like(x)
+    for _ in range(iterations):
+        mid = (lo + hi) * 0.5
+        bx = ((1 - 3 * x2 + 3 * x1) * mid + (3 * x2 - 6 * x1)) * mid * mid + 3 * x1 * mid
+        below = bx < x
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    s = (lo + hi) * 0.5
+    return ((1 - 3 * y2 + 3 * y1) * s + (3 * y2 - 6 * y1)) * s * s + 3 * y1 * s
+
+def check_timelines(rows):
+    """Validate many settings dicts at once; returns ``[(index, [problem, ...]), ...]`` for the bad ones."""
+    bad = []
+    for i, row in enumerate(rows):
+        try:
+            issues = Timeline.from_settings(row).problems()
+        except (KeyError, TypeError, ValueError) as e:
+            issues = [f"{type(e).__name__}: {e}"]
+        if issues:
+            bad.append((i, issues))
+    return bad